@@ -185,12 +185,16 @@ class EncarDatabase:
         2. Recent registration date (secondary) 
         3. Low view count (tertiary)
         """
-        criteria = config.get('new_listing_criteria', {})
-        
         # Check if it exists in database
         if self.listing_exists(listing_data['car_id']):
             return False  # Already seen, not new
         
+        return self._matches_truly_new_criteria(listing_data, config)
+    
+    def _matches_truly_new_criteria(self, listing_data: Dict, config: Dict) -> bool:
+        """Apply the registration-age and view-count rules to an unseen listing."""
+        criteria = config.get('new_listing_criteria', {})
+        
         # Check registration date recency
         max_age_days = criteria.get('max_registration_age_days', 30)
         days_since_reg = self.calculate_days_since_registration(
@@ -238,130 +242,183 @@ class EncarDatabase:
         """
         try:
             with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check if listing already exists
-                cursor.execute("SELECT id, views, registration_date, days_since_registration, price FROM listings WHERE car_id = ?", 
-                             (listing_data['car_id'],))
-                row = cursor.fetchone()
-                existing = None
-                if row:
-                    existing = {
-                        'id': row[0],
-                        'views': row[1], 
-                        'registration_date': row[2],
-                        'days_since_registration': row[3],
-                        'price': row[4]
-                    }
-                
-                # Parse additional data
-                days_since_reg = self.calculate_days_since_registration(listing_data.get('registration_date', ''))
-                price_millions = self.parse_price_to_numeric(listing_data.get('price', ''))
-                
-                # Extract lease information
-                is_lease = listing_data.get('is_lease', False)
-                lease_info = listing_data.get('lease_info', {})
-                
-                # Extract lease components with new variable naming
-                estimated_price = lease_info.get('estimated_price') if lease_info else None  # Previously 'true_price'
-                total_cost = lease_info.get('total_cost') if lease_info else None  # This will be mapped to 'true_price' in DB
-                lease_deposit = lease_info.get('deposit') if lease_info else None
-                lease_monthly_payment = lease_info.get('monthly_payment') if lease_info else None
-                lease_term_months = lease_info.get('lease_term_months') if lease_info else None
-                final_payment = lease_info.get('final_payment') if lease_info else None
-                
-                # Calculate total monthly cost if we have monthly payment and term
-                if lease_monthly_payment and lease_term_months:
-                    lease_total_monthly_cost = lease_monthly_payment * lease_term_months
-                else:
-                    lease_total_monthly_cost = lease_info.get('total_monthly_cost') if lease_info else None
-                
-                # Map variables to database columns:
-                # - estimated_price -> price (for lease vehicles)
-                # - total_cost -> true_price (for lease vehicles)
-                # - For non-lease vehicles, use price_millions for both price and true_price
-                db_price = estimated_price if is_lease and estimated_price is not None else price_millions
-                db_true_price = total_cost if is_lease and total_cost is not None else price_millions
-                
-                # Determine if truly new (only if config provided)
-                is_truly_new = False
-                if config and not existing:
-                    is_truly_new = self.is_truly_new_listing(listing_data, config)
-                
-                if existing:
-                    # Check if this is an API-only update (no browser data)
-                    is_api_only_update = (
-                        listing_data.get('api_source', False) and 
-                        listing_data.get('views', 0) == 0 and 
-                        not listing_data.get('registration_date')
-                    )
-                    
-                    if is_api_only_update and (existing['views'] > 0 or existing['registration_date']):
-                        # Preserve existing browser-extracted data
-                        self.logger.debug(f"Preserving browser data for {listing_data['car_id']}: views={existing['views']}, reg_date={existing['registration_date']}")
-                        preserve_views = existing['views']
-                        preserve_registration_date = existing['registration_date']
-                        preserve_days_since_reg = existing['days_since_registration']
-                    else:
-                        # Use new data (normal browser update or first-time data)
-                        preserve_views = listing_data['views']
-                        preserve_registration_date = listing_data['registration_date']
-                        preserve_days_since_reg = days_since_reg
-                    
-                    # Update existing listing
-                    cursor.execute('''
-                        UPDATE listings SET 
-                            title = ?, model = ?, year = ?, price = ?, mileage = ?,
-                            views = ?, registration_date = ?, listing_url = ?, 
-                            last_updated = CURRENT_TIMESTAMP, 
-                            is_coupe = ?, days_since_registration = ?,
-                            is_lease = ?, true_price = ?, lease_deposit = ?, 
-                            lease_monthly_payment = ?, lease_term_months = ?, 
-                            lease_total_monthly_cost = ?, final_payment = ?
-                        WHERE car_id = ?
-                    ''', (
-                        listing_data['title'], listing_data['model'], 
-                        listing_data['year'], db_price,  # Use mapped price
-                        listing_data['mileage'], preserve_views,
-                        preserve_registration_date, listing_data['listing_url'],
-                        listing_data['is_coupe'], preserve_days_since_reg,
-                        is_lease, db_true_price, lease_deposit,  # Use mapped true_price
-                        lease_monthly_payment, lease_term_months,
-                        lease_total_monthly_cost, final_payment,
-                        listing_data['car_id']
-                    ))
-                    
-                    conn.commit()
-                    return 'updated'
-                    
-                else:
-                    # Insert new listing
-                    cursor.execute('''
-                        INSERT INTO listings (
-                            car_id, title, model, year, price, mileage, views,
-                            registration_date, listing_url, is_coupe, is_truly_new, 
-                            days_since_registration, is_lease, true_price,
-                                                                      lease_deposit, lease_monthly_payment, lease_term_months,
-                                          lease_total_monthly_cost, final_payment
-                                      ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        listing_data['car_id'], listing_data['title'], 
-                        listing_data['model'], listing_data['year'],
-                        db_price, listing_data['mileage'],  # Use mapped price
-                        listing_data['views'], listing_data['registration_date'],
-                        listing_data['listing_url'], listing_data['is_coupe'], 
-                        is_truly_new, days_since_reg, is_lease, db_true_price,  # Use mapped true_price
-                                                              lease_deposit, lease_monthly_payment, lease_term_months,
-                                      lease_total_monthly_cost, final_payment
-                    ))
-                    
-                    conn.commit()
-                    return 'new'
+                return self._save_listing_row(conn.cursor(), listing_data, config)
                     
         except Exception as e:
             logging.error(f"Error saving listing {listing_data.get('car_id', 'unknown')}: {e}")
             return 'error'
     
+    def save_listings_batch(self, listings: List[Dict], config: Dict = None,
+                            collect_truly_new: bool = False) -> Dict:
+        """
+        Save or update many listings in a single transaction.
+        Returns counts keyed by save_listing's results ('new', 'updated', 'error')
+        plus 'truly_new': with collect_truly_new, the inserted coupe listings that
+        meet the truly-new criteria, already marked processed as
+        get_truly_new_listings would leave them.
+        """
+        truly_new = [] if collect_truly_new else None
+        counts = {'new': 0, 'updated': 0, 'error': 0, 'truly_new': truly_new if collect_truly_new else []}
+        if not listings:
+            return counts
+        
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor = conn.cursor()
+                
+                for listing_data in listings:
+                    try:
+                        result = self._save_listing_row(cursor, listing_data, config, truly_new)
+                    except Exception as e:
+                        logging.error(f"Error saving listing {listing_data.get('car_id', 'unknown')}: {e}")
+                        result = 'error'
+                    counts[result] += 1
+                    
+        except Exception as e:
+            logging.error(f"Error saving listing batch: {e}")
+            return {'new': 0, 'updated': 0, 'error': len(listings), 'truly_new': []}
+        
+        return counts
+    
+    def _save_listing_row(self, cursor, listing_data: Dict, config: Dict = None,
+                          truly_new: List[Dict] = None) -> str:
+        """
+        Insert or update one listing on an open cursor; the caller commits.
+        If truly_new is given, truly new coupe inserts are appended to it
+        instead of being flagged for get_truly_new_listings.
+        """
+        # Check if listing already exists
+        cursor.execute("SELECT id, views, registration_date, days_since_registration, price FROM listings WHERE car_id = ?", 
+                     (listing_data['car_id'],))
+        row = cursor.fetchone()
+        existing = None
+        if row:
+            existing = {
+                'id': row[0],
+                'views': row[1], 
+                'registration_date': row[2],
+                'days_since_registration': row[3],
+                'price': row[4]
+            }
+        
+        # Parse additional data
+        days_since_reg = self.calculate_days_since_registration(listing_data.get('registration_date', ''))
+        price_millions = self.parse_price_to_numeric(listing_data.get('price', ''))
+        
+        # Extract lease information
+        is_lease = listing_data.get('is_lease', False)
+        lease_info = listing_data.get('lease_info', {})
+        
+        # Extract lease components with new variable naming
+        estimated_price = lease_info.get('estimated_price') if lease_info else None  # Previously 'true_price'
+        total_cost = lease_info.get('total_cost') if lease_info else None  # This will be mapped to 'true_price' in DB
+        lease_deposit = lease_info.get('deposit') if lease_info else None
+        lease_monthly_payment = lease_info.get('monthly_payment') if lease_info else None
+        lease_term_months = lease_info.get('lease_term_months') if lease_info else None
+        final_payment = lease_info.get('final_payment') if lease_info else None
+        
+        # Calculate total monthly cost if we have monthly payment and term
+        if lease_monthly_payment and lease_term_months:
+            lease_total_monthly_cost = lease_monthly_payment * lease_term_months
+        else:
+            lease_total_monthly_cost = lease_info.get('total_monthly_cost') if lease_info else None
+        
+        # Map variables to database columns:
+        # - estimated_price -> price (for lease vehicles)
+        # - total_cost -> true_price (for lease vehicles)
+        # - For non-lease vehicles, use price_millions for both price and true_price
+        db_price = estimated_price if is_lease and estimated_price is not None else price_millions
+        db_true_price = total_cost if is_lease and total_cost is not None else price_millions
+        
+        # Determine if truly new (only if config provided)
+        is_truly_new = False
+        if config and not existing:
+            # Existence was just checked on this cursor, which also sees
+            # rows inserted earlier in the same batch
+            is_truly_new = self._matches_truly_new_criteria(listing_data, config)
+        
+        # Truly new coupes handed straight to the caller are stored as already
+        # processed, as get_truly_new_listings would leave them
+        claimed = is_truly_new and truly_new is not None and listing_data['is_coupe']
+        if claimed:
+            is_truly_new = False
+        
+        if existing:
+            # Check if this is an API-only update (no browser data)
+            is_api_only_update = (
+                listing_data.get('api_source', False) and 
+                listing_data.get('views', 0) == 0 and 
+                not listing_data.get('registration_date')
+            )
+            
+            if is_api_only_update and (existing['views'] > 0 or existing['registration_date']):
+                # Preserve existing browser-extracted data
+                self.logger.debug(f"Preserving browser data for {listing_data['car_id']}: views={existing['views']}, reg_date={existing['registration_date']}")
+                preserve_views = existing['views']
+                preserve_registration_date = existing['registration_date']
+                preserve_days_since_reg = existing['days_since_registration']
+            else:
+                # Use new data (normal browser update or first-time data)
+                preserve_views = listing_data['views']
+                preserve_registration_date = listing_data['registration_date']
+                preserve_days_since_reg = days_since_reg
+            
+            # Update existing listing
+            cursor.execute('''
+                UPDATE listings SET 
+                    title = ?, model = ?, year = ?, price = ?, mileage = ?,
+                    views = ?, registration_date = ?, listing_url = ?, 
+                    last_updated = CURRENT_TIMESTAMP, 
+                    is_coupe = ?, days_since_registration = ?,
+                    is_lease = ?, true_price = ?, lease_deposit = ?, 
+                    lease_monthly_payment = ?, lease_term_months = ?, 
+                    lease_total_monthly_cost = ?, final_payment = ?
+                WHERE car_id = ?
+            ''', (
+                listing_data['title'], listing_data['model'], 
+                listing_data['year'], db_price,  # Use mapped price
+                listing_data['mileage'], preserve_views,
+                preserve_registration_date, listing_data['listing_url'],
+                listing_data['is_coupe'], preserve_days_since_reg,
+                is_lease, db_true_price, lease_deposit,  # Use mapped true_price
+                lease_monthly_payment, lease_term_months,
+                lease_total_monthly_cost, final_payment,
+                listing_data['car_id']
+            ))
+            
+            return 'updated'
+            
+        else:
+            # Insert new listing
+            cursor.execute('''
+                INSERT INTO listings (
+                    car_id, title, model, year, price, mileage, views,
+                    registration_date, listing_url, is_coupe, is_truly_new, 
+                    days_since_registration, is_lease, true_price,
+                                                              lease_deposit, lease_monthly_payment, lease_term_months,
+                                  lease_total_monthly_cost, final_payment
+                              ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                listing_data['car_id'], listing_data['title'], 
+                listing_data['model'], listing_data['year'],
+                db_price, listing_data['mileage'],  # Use mapped price
+                listing_data['views'], listing_data['registration_date'],
+                listing_data['listing_url'], listing_data['is_coupe'], 
+                is_truly_new, days_since_reg, is_lease, db_true_price,  # Use mapped true_price
+                                                      lease_deposit, lease_monthly_payment, lease_term_months,
+                              lease_total_monthly_cost, final_payment
+            ))
+            
+            if claimed:
+                truly_new.append({
+                    **listing_data,
+                    'days_since_registration': days_since_reg,
+                    'is_truly_new': True
+                })
+            
+            return 'new'
+    
     def update_listing_data(self, car_id: str, views: int = None, registration_date: str = None, 
                            is_lease: bool = None, lease_info: Dict = None) -> bool:
         """
@@ -599,7 +656,7 @@ class EncarDatabase:
                 # Mark these listings as no longer "truly new" to avoid duplicate notifications
                 if listings:
                     car_ids = [listing['car_id'] for listing in listings]
-                    placeholders = ','.join(['?' for _ in car_ids])
+                    placeholders = ','.join('?' * len(car_ids))
                     cursor.execute(f'''
                         UPDATE listings 
                         SET is_truly_new = 0
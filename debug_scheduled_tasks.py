@@ -5,12 +5,14 @@ Quick debugging script to test all scheduled tasks and their Telegram notificati
 """
 
 import asyncio
-import schedule
 from datetime import datetime, timedelta
-from encar_monitor_api import EncarMonitorAPI
 
 async def debug_all_tasks():
     """Debug all scheduled tasks"""
+    # Heavy imports (Playwright, aiohttp, ...) are deferred until actually needed
+    import schedule
+    from encar_monitor_api import EncarMonitorAPI
+
     print("🔍 SCHEDULED TASKS DEBUGGER")
     print("=" * 50)
     
@@ -35,13 +37,21 @@ async def debug_all_tasks():
         schedule.every(6).hours.do(lambda: print("🔍 Closure scan would run now"))
         schedule.every().sunday.at("02:00").do(lambda: print("🧹 Weekly cleanup would run now"))
         
-        # Show current schedule status
-        jobs = schedule.jobs
-        print(f"📅 Total scheduled jobs: {len(jobs)}")
+        # Show current schedule status and prepare timing analysis in one pass
+        jobs = list(schedule.jobs)
+        now = datetime.now()
+        now_ts = now.timestamp()
+        job_lines = [f"📅 Total scheduled jobs: {len(jobs)}"]
+        timing_lines = []
         for i, job in enumerate(jobs, 1):
             # Fix for schedule library API - use job.job_func instead of job.job
             func_name = getattr(job.job_func, '__name__', str(job.job_func))
-            print(f"  {i}. Next run: {job.next_run} | Function: {func_name}")
+            seconds_until = job.next_run.timestamp() - now_ts
+            hours, minutes = int(seconds_until // 3600), int(seconds_until % 3600 // 60)
+            next_run = job.next_run.strftime('%Y-%m-%d %H:%M:%S')
+            job_lines.append(f"  {i}. Next run: {job.next_run} | Function: {func_name}")
+            timing_lines.append(f"⏰ Next '{func_name}' in: {hours}h {minutes}m ({next_run})")
+        print("\n".join(job_lines))
         
         print("\n2️⃣ TESTING TELEGRAM NOTIFICATIONS")
         print("-" * 30)
@@ -65,17 +75,11 @@ async def debug_all_tasks():
         print("\n4️⃣ SCHEDULE TIMING ANALYSIS")
         print("-" * 30)
         
-        now = datetime.now()
         print(f"🕐 Current time: {now.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"📅 Day of week: {now.strftime('%A')}")
         
-        # Check when next scheduled events would occur
-        for job in schedule.jobs:
-            time_until = job.next_run - now
-            hours = int(time_until.total_seconds() / 3600)
-            minutes = int((time_until.total_seconds() % 3600) / 60)
-            func_name = getattr(job.job_func, '__name__', str(job.job_func))
-            print(f"⏰ Next '{func_name}' in: {hours}h {minutes}m ({job.next_run.strftime('%Y-%m-%d %H:%M:%S')})")
+        # Next scheduled events (computed alongside the job listing above)
+        print("\n".join(timing_lines))
         
         print("\n5️⃣ RECOMMENDATIONS")
         print("-" * 30)
@@ -5,15 +5,88 @@ Extracts authentication from browser session and uses direct API calls
 """
 
 import asyncio
+import functools
 import aiohttp
+import orjson
 import logging
+import random
+import re
+import sys
+import time
+import weakref
+from collections import deque
+from multidict import CIMultiDict
+from yarl import URL
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from playwright.async_api import async_playwright
+from pathlib import Path
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 # Removed deprecated convert_manwon_to_won import
 
+# Keywords that mark a model/badge as a coupe
+COUPE_RE = re.compile(r'쿠페|coupe', re.IGNORECASE)
+
+# Browser session saved between auth refreshes, and how long it is reused without navigating.
+# It holds live session cookies: kept next to this module (not the cwd) and gitignored.
+AUTH_STATE_PATH = Path(__file__).resolve().parent / '.encar_state.json'
+AUTH_STATE_TTL = timedelta(hours=1)
+
+# How long before auth expiry the background refresh runs
+AUTH_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Upper bounds on how much of an API response body is read into memory
+MAX_RESPONSE_BYTES = 50 * 1024 * 1024
+ERROR_BODY_BYTES = 4096
+
+# Resource types that don't affect the session cookies, so auth navigation skips them
+BLOCKED_RESOURCE_TYPES = frozenset(('image', 'font', 'stylesheet', 'media'))
+
+# Minimal headers for unauthenticated (direct) API calls
+DIRECT_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Referer': 'http://www.encar.com/'
+}
+
+class _TokenBucket:
+    """Async token-bucket rate limiter shared by all requests on a connection pool"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.updated_at = time.monotonic()
+                self.tokens = 0
+            else:
+                self.tokens -= 1
+
+# Concurrency semaphore and rate limiter per shared connection pool, so clients sharing
+# a session/connector also share its limits instead of each adding their own
+_shared_limits = weakref.WeakKeyDictionary()  # connector -> (semaphore, token bucket)
+
 class EncarAPIClient:
-    def __init__(self, config: dict):
+    # Default maximum number of API requests in flight at the same time
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    def __init__(self, config: dict, *, session: Optional[aiohttp.ClientSession] = None,
+                 connector: Optional[aiohttp.BaseConnector] = None, auth_state: Optional[dict] = None):
+        """Create a client; several clients can share one HTTP session/connector and auth state
+        
+        session: an open ClientSession to use as-is (not closed by this client)
+        connector: a connector shared by the session this client creates (not closed by this client)
+        Clients on the same connector share one concurrency limit and request rate limit.
+        auth_state: cookies/headers/valid_until from another client's export_auth_state()
+        """
         self.config = config
         self.logger = logging.getLogger(__name__)
         
@@ -24,121 +97,199 @@ class EncarAPIClient:
             'premium': f"{self.api_base}/search/car/list/premium"
         }
         
+        # Unfiltered search query, used by almost every request
+        self._base_query = self._build_query_cached(frozenset())
+        
         # Authentication data
         self.session_cookies = {}
         self.session_headers = {}
         self.auth_valid_until = None
+        self.storage_state = None
+        self._direct_api_ok: Optional[bool] = None  # None until probed
+        self._auth_lock = asyncio.Lock()  # Serializes auth refreshes across concurrent requests
+        self._refresh_task: Optional[asyncio.Task] = None  # Background auth refresh before expiry
+        self._cached_totals: Dict[Tuple[str, str], int] = {}  # (endpoint_type, query) -> last Count reported
         
         # Session management
-        self.http_session = None
+        self.http_session = session
+        self._owns_session = session is None
+        self._connector = connector
         self.auth_browser = None
+        self._pw = None
         
+        if auth_state:
+            self.session_cookies = dict(auth_state['cookies'])
+            self.session_headers = dict(auth_state['headers'])
+            self.auth_valid_until = auth_state['valid_until']
+            if self.http_session and not self.http_session.closed:
+                self._load_session_cookies()
+        
+        # Per-host concurrency limit and request rate limit (bursts up to 16 requests) for
+        # api.encar.com; the first client on a shared connection pool sets them for all
+        self.max_concurrent = config.get('api_integration', {}).get('concurrent_requests', self.MAX_CONCURRENT_REQUESTS)
+        pool = session.connector if session is not None else connector
+        limits = _shared_limits.get(pool) if pool is not None else None
+        if limits is None:
+            requests_per_minute = config.get('api_integration', {}).get('requests_per_minute', 480)
+            limits = (asyncio.Semaphore(self.max_concurrent), _TokenBucket(rate=requests_per_minute / 60, capacity=16))
+            if pool is not None:
+                _shared_limits[pool] = limits
+        self._api_sem, self._limiter = limits
+        
+    @property
+    def session_headers(self) -> dict:
+        """Headers matching the browser session the auth was extracted from"""
+        return self._session_headers
+    
+    @session_headers.setter
+    def session_headers(self, value: dict):
+        self._session_headers = value
+        # aiohttp would convert a plain dict to CIMultiDict on every request; do it once here
+        self._request_headers = CIMultiDict(value)
+    
+    @property
+    def auth_valid_until(self) -> Optional[datetime]:
+        """Wall-clock auth expiry (for logging/scheduling; validity checks use the monotonic deadline)"""
+        return self._auth_valid_until
+    
+    @auth_valid_until.setter
+    def auth_valid_until(self, value: Optional[datetime]):
+        self._auth_valid_until = value
+        self._auth_deadline = time.monotonic() + (value - datetime.now()).total_seconds() if value else None
+    
+    def _auth_fresh(self) -> bool:
+        """Monotonic-clock check of the current auth window"""
+        return self._auth_deadline is not None and time.monotonic() < self._auth_deadline
+    
     async def __aenter__(self):
-        """Async context manager entry"""
-        # Close existing session if it exists
+        """Async context manager entry (idempotent: an open session is kept)"""
         if self.http_session and not self.http_session.closed:
-            await self.http_session.close()
+            return self
         
-        # Create session with better connector configuration
-        connector = aiohttp.TCPConnector(
-            limit=100,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-        )
+        # All traffic goes to api.encar.com, so cap per host and keep idle connections
+        # around long enough to be reused across paging bursts
+        connector = self._connector
+        if connector is None:
+            api_config = self.config.get('api_integration', {})
+            connector = aiohttp.TCPConnector(
+                limit=api_config.get('connector_limit', 64),
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                use_dns_cache=True,
+                keepalive_timeout=75,
+            )
         
         # Create session with timeout and proxy support
         timeout = aiohttp.ClientTimeout(total=30, connect=10)
         self.http_session = aiohttp.ClientSession(
             connector=connector,
+            connector_owner=self._connector is None,  # A shared connector outlives this session
             timeout=timeout,
             trust_env=True  # Respect proxy environment variables
         )
+        self._owns_session = True
+        
+        # Restore extracted auth cookies into the new session's jar
+        if self.session_cookies:
+            self._load_session_cookies()
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.http_session and not self.http_session.closed:
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._owns_session and self.http_session and not self.http_session.closed:
             await self.http_session.close()
-            self.http_session = None
+        self.http_session = None
         if self.auth_browser:
             await self.auth_browser.close()
             self.auth_browser = None
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+    
+    def export_auth_state(self) -> dict:
+        """Current auth for seeding other clients via EncarAPIClient(config, auth_state=...)"""
+        return {
+            'cookies': dict(self.session_cookies),
+            'headers': dict(self.session_headers),
+            'valid_until': self.auth_valid_until
+        }
     
     async def cleanup_sessions(self):
         """Manually cleanup any unclosed sessions"""
-        if self.http_session and not self.http_session.closed:
+        if self._owns_session and self.http_session and not self.http_session.closed:
             self.logger.debug("Cleaning up HTTP session")
             await self.http_session.close()
             self.http_session = None
     
+    def _load_session_cookies(self):
+        """Put the extracted auth cookies into the HTTP session's cookie jar"""
+        cookie_jar = self.http_session.cookie_jar
+        if self._owns_session:
+            cookie_jar.clear()
+        # An injected session may be shared with other clients; updating overwrites
+        # same-name cookies without wiping anyone else's
+        cookie_jar.update_cookies(self.session_cookies, response_url=URL(self.api_base))
+    
+    async def _ensure_browser(self):
+        """Launch the shared Playwright browser on first use and reuse it afterwards"""
+        if self.auth_browser is None or not self.auth_browser.is_connected():
+            if self._pw is None:
+                # Imported here so clients that never need browser auth don't load Playwright
+                from playwright.async_api import async_playwright
+                self._pw = await async_playwright().start()
+            self.auth_browser = await self._pw.chromium.launch(
+                headless=self.config['browser']['headless']
+            )
+        return self.auth_browser
+    
     async def extract_authentication(self) -> bool:
         """Extract authentication tokens from browser session"""
         try:
             self.logger.debug("Extracting authentication from browser session...")
             
-            async with async_playwright() as p:
-                # Launch browser in headless mode
-                browser = await p.chromium.launch(
-                    headless=self.config['browser']['headless']
-                )
-                
-                context = await browser.new_context()
+            # A recently saved session already holds the cookies the homepage visit would set
+            warm_state = self._get_warm_storage_state()
+            
+            browser = await self._ensure_browser()
+            context = await browser.new_context(storage_state=warm_state)
+            try:
                 page = await context.new_page()
+                await context.route("**/*", self._block_heavy_resources)
                 
-                # Navigate to main search page to establish session
+                # Navigate to main search page to establish session (unless a saved one is still fresh)
                 search_url = self.build_search_url()
-                self.logger.debug(f"Navigating to: {search_url}")
+                if warm_state:
+                    self.logger.debug("Reusing saved browser session, skipping homepage navigation")
+                else:
+                    self.logger.debug(f"Navigating to: {search_url}")
+                    await self._navigate_for_session(page, search_url)
                 
-                try:
-                    # Use shorter timeout and better error handling
-                    await page.goto(search_url, wait_until='domcontentloaded', timeout=20000)
-                    self.logger.debug("Initial page load completed")
-                    
-                    # Wait a bit for dynamic content
-                    await page.wait_for_timeout(3000)
-                    
-                    # Check what we got
-                    page_title = await page.title()
-                    page_url = page.url
-                    self.logger.debug(f"   Page title: {page_title}")
-                    self.logger.debug(f"   Page URL: {page_url}")
-                    
-                    # Try to find car listings with more relaxed criteria
-                    try:
-                        await page.wait_for_selector('body', timeout=5000)  # Just ensure page is ready
-                        self.logger.debug("Page body loaded")
-                        
-                        # Check for any indicators that we're on the right page
-                        content = await page.content()
-                        if 'encar' in content.lower() or '벤츠' in content or 'gle' in content.lower():
-                            self.logger.debug("Detected Encar content on page")
-                        else:
-                            self.logger.warning("Page content doesn't look like Encar, but continuing...")
-                            
-                    except Exception as e:
-                        self.logger.warning(f"Could not find expected elements: {e}")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Page navigation issue: {e}")
-                    # Continue anyway - we might still be able to extract cookies
-                    page_title = await page.title()
-                    self.logger.debug(f"   Current page title: {page_title}")
+                # Keep cookies/localStorage so other contexts can start from this session; only a fresh
+                # navigation is saved to disk, so the saved session ages out after AUTH_STATE_TTL
+                save_path = None if warm_state else str(AUTH_STATE_PATH)
+                self.storage_state = await context.storage_state(path=save_path)
                 
-                # Extract cookies
+                # Extract cookies and the exact User-Agent from the browser
                 cookies = await context.cookies()
-                self.session_cookies = {cookie['name']: cookie['value'] for cookie in cookies}
-                self.logger.debug(f"Extracted {len(self.session_cookies)} cookies")
-                
-                # Extract exact User-Agent from browser
                 user_agent = await page.evaluate('navigator.userAgent')
                 self.logger.debug(f"Browser User-Agent: {user_agent}")
                 
+                # From here on there is no await, so in-flight requests never see a mix of
+                # old and new cookies/headers while a background refresh swaps them in
+                self.session_cookies = {cookie['name']: cookie['value'] for cookie in cookies}
+                self.logger.debug(f"Extracted {len(self.session_cookies)} cookies")
+                if self.http_session and not self.http_session.closed:
+                    self._load_session_cookies()
+                
                 # Build session headers to exactly match browser
                 self.session_headers = {
                     'User-Agent': user_agent,
                     'Accept': 'application/json, text/plain, */*',
                     'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                    'Accept-Encoding': 'gzip, deflate, br, zstd',
+                    'Accept-Encoding': self.config.get('api_integration', {}).get('accept_encoding', 'br, gzip'),
                     'Referer': search_url,  # Use the actual page we visited
                     'Origin': 'http://www.encar.com',
                     'X-Requested-With': 'XMLHttpRequest',
@@ -152,22 +303,116 @@ class EncarAPIClient:
                     'Pragma': 'no-cache'
                 }
                 
-                await browser.close()
-                
-                # Set auth validity
-                self.auth_valid_until = datetime.now() + timedelta(hours=1)
+                # Set auth validity from the earliest expiring cookie (with a safety margin),
+                # falling back to 1 hour when all cookies are session cookies
+                min_expiry = min((c['expires'] for c in cookies if c.get('expires', -1) > 0), default=None)
+                cookie_valid_until = (datetime.fromtimestamp(min_expiry) - timedelta(minutes=5)
+                                      if min_expiry else None)
+                if cookie_valid_until and cookie_valid_until > datetime.now():
+                    self.auth_valid_until = cookie_valid_until
+                else:
+                    self.auth_valid_until = datetime.now() + timedelta(hours=1)
                 
                 self.logger.debug(f"Authentication extracted successfully")
                 self.logger.debug(f"   Cookies: {len(self.session_cookies)} items")
                 self.logger.debug(f"   Headers: {len(self.session_headers)} items")
                 self.logger.debug(f"   Valid until: {self.auth_valid_until}")
                 
+                self._schedule_auth_refresh()
                 return True
+            finally:
+                await context.close()
                 
         except Exception as e:
             self.logger.error(f"Failed to extract authentication: {e}")
             return False
     
+    def _schedule_auth_refresh(self):
+        """Refresh auth in the background shortly before it expires, off the request path"""
+        if not self.config.get('api_integration', {}).get('auto_refresh_auth', True):
+            return
+        delay = (self.auth_valid_until - AUTH_REFRESH_MARGIN - datetime.now()).total_seconds()
+        if delay <= 0:
+            return  # Too close to expiry; ensure_authenticated refreshes it on the next request
+        if self._refresh_task and not self._refresh_task.done() and self._refresh_task is not asyncio.current_task():
+            self._refresh_task.cancel()
+        self._refresh_task = asyncio.create_task(self._refresh_before_expiry(delay))
+    
+    async def _refresh_before_expiry(self, delay: float):
+        """Wait until just before auth expiry, then re-extract it from a fresh browser session"""
+        await asyncio.sleep(delay)
+        self.logger.debug("Refreshing authentication before expiry...")
+        self._discard_saved_session()  # The saved session holds the cookies that are about to expire
+        async with self._auth_lock:
+            await self.extract_authentication()
+    
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """Abort requests for images/fonts/CSS/media, let everything else through"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def _navigate_for_session(self, page, search_url: str):
+        """Load the Encar homepage so the browser context receives session cookies"""
+        try:
+            # Use shorter timeout and better error handling
+            await page.goto(search_url, wait_until='domcontentloaded', timeout=20000)
+            self.logger.debug("Initial page load completed")
+            
+            # Wait (up to 3s) for the PCID session cookie instead of sleeping a fixed 3s. The
+            # context's cookie store is polled because HttpOnly cookies never show in document.cookie
+            deadline = time.monotonic() + 3
+            while not any(cookie['name'] == 'PCID' for cookie in await page.context.cookies()):
+                if time.monotonic() >= deadline:
+                    self.logger.debug("PCID cookie not set yet, continuing")
+                    break
+                await asyncio.sleep(0.1)
+            
+            # Check what we got
+            page_title = await page.title()
+            page_url = page.url
+            self.logger.debug(f"   Page title: {page_title}")
+            self.logger.debug(f"   Page URL: {page_url}")
+            
+            # Try to find car listings with more relaxed criteria
+            try:
+                await page.wait_for_selector('body', timeout=5000)  # Just ensure page is ready
+                self.logger.debug("Page body loaded")
+                
+                # Check for any indicators that we're on the right page (in the browser,
+                # so the serialized DOM isn't copied over just for this check)
+                looks_like_encar = await page.evaluate(
+                    "() => /encar|벤츠|gle/i.test(document.documentElement.outerHTML)"
+                )
+                if looks_like_encar:
+                    self.logger.debug("Detected Encar content on page")
+                else:
+                    self.logger.warning("Page content doesn't look like Encar, but continuing...")
+                    
+            except Exception as e:
+                self.logger.warning(f"Could not find expected elements: {e}")
+                
+        except Exception as e:
+            self.logger.warning(f"Page navigation issue: {e}")
+            # Continue anyway - we might still be able to extract cookies
+            page_title = await page.title()
+            self.logger.debug(f"   Current page title: {page_title}")
+    
+    def _get_warm_storage_state(self) -> Optional[str]:
+        """Return the saved storage state path if it is recent enough to reuse"""
+        try:
+            age = datetime.now().timestamp() - AUTH_STATE_PATH.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        return str(AUTH_STATE_PATH) if age < AUTH_STATE_TTL.total_seconds() else None
+    
+    def _discard_saved_session(self):
+        """Delete the saved storage state so the next refresh does a full re-auth"""
+        AUTH_STATE_PATH.unlink(missing_ok=True)
+        self.storage_state = None
+    
     def build_search_url(self) -> str:
         """Build search URL for browser navigation"""
         # Use simpler URL first to establish session, then redirect to specific search
@@ -175,6 +420,17 @@ class EncarAPIClient:
     
     def build_api_query(self, filters: dict = None) -> str:
         """Build API query string with advanced filtering support"""
+        if not filters:
+            return self._base_query
+        # The query only depends on the filters, so it is cached per distinct filter set
+        return self._build_query_cached(frozenset(filters.items()))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _build_query_cached(filters_key: frozenset) -> str:
+        """Build the API query string for a hashable filter set"""
+        filters = dict(filters_key)
+        
         # More specific base query targeting GLE Coupe models directly
         # Based on: https://www.encar.com/fc/fc_carsearchlist.do?carType=for
         base_part = "(And.Hidden.N._.(C.CarType.N._.(C.Manufacturer.벤츠._.(C.ModelGroup.GLE-클래스._.(C.Model.GLE-클래스 W167._.(Or.(C.BadgeGroup.가솔린 4WD._.(Or.Badge.GLE450 4MATIC 쿠페._.Badge.AMG GLE53 4MATIC+ 쿠페._.Badge.AMG GLE63 S 4MATIC+ 쿠페.))_.(C.BadgeGroup.디젤 4WD._.(Or.Badge.GLE450d 4MATIC 쿠페._.Badge.GLE400d 4MATIC 쿠페.)))))))"
@@ -235,113 +491,156 @@ class EncarAPIClient:
     
     async def is_auth_valid(self) -> bool:
         """Check if current authentication is still valid"""
-        if not self.auth_valid_until:
-            return False
-        return datetime.now() < self.auth_valid_until
+        return self._auth_fresh()
     
     async def ensure_authenticated(self) -> bool:
         """Ensure we have valid authentication"""
-        if await self.is_auth_valid():
+        if self._auth_fresh():
             return True
         
-        self.logger.debug("Authentication expired, refreshing...")
-        return await self.extract_authentication()
+        # Only one task refreshes; concurrent callers wait and then reuse its result
+        async with self._auth_lock:
+            if self._auth_fresh():
+                return True
+            
+            # Skip browser authentication entirely when the API answers plain requests
+            if self._direct_api_ok is None:
+                self._direct_api_ok = await self.probe_direct_api()
+                if self._direct_api_ok:
+                    self.logger.debug("Direct API access works, skipping browser authentication")
+                    self.session_headers = dict(DIRECT_API_HEADERS)
+                    self.auth_valid_until = datetime.now() + timedelta(hours=24)
+                    return True
+            
+            self.logger.debug("Authentication expired, refreshing...")
+            return await self.extract_authentication()
+    
+    async def probe_direct_api(self) -> bool:
+        """Check whether the API responds to an unauthenticated request"""
+        if not self.http_session or self.http_session.closed:
+            await self.__aenter__()
+        
+        params = {
+            'count': 'true',
+            'q': self.build_api_query(),
+            'sr': '|ModifiedDate|0|1'
+        }
+        try:
+            async with self.http_session.get(
+                self.endpoints['general'],
+                params=params,
+                headers=DIRECT_API_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                self.logger.debug(f"Direct API probe - Status: {response.status}")
+                return response.status == 200
+        except Exception as e:
+            self.logger.debug(f"Direct API probe failed: {e}")
+            return False
     
-    async def make_api_request_with_browser(self, endpoint: str, params: dict) -> Optional[dict]:
+    async def make_api_request_with_browser(self, endpoint, params: Optional[dict] = None) -> Optional[dict]:
         """Make API request using Playwright - fallback for 407 errors"""
         try:
             self.logger.debug(f"Using browser for API request: {endpoint}")
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(
-                    headless=self.config['browser']['headless']
-                )
-                
-                context = await browser.new_context()
-                page = await context.new_page()
-                
-                # Build URL with parameters
-                param_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-                api_url = f"{endpoint}?{param_string}"
-                
-                self.logger.debug(f"Browser API URL: {api_url}")
+            browser = await self._ensure_browser()
+            context = await browser.new_context(storage_state=self.storage_state)
+            try:
+                self.logger.debug(f"Browser API params: {params}")
                 
-                # Navigate to API endpoint 
-                response = await page.goto(api_url)
+                # Request the API through the browser's HTTP client (shares its cookies/TLS)
+                # instead of rendering the JSON as a page and scraping it back out
+                response = await context.request.get(
+                    str(endpoint),
+                    params=params,
+                    headers=self.session_headers or None
+                )
                 
-                if response.status == 200:
-                    # Get JSON response
-                    content = await page.content()
-                    
-                    # Try to extract JSON from page
-                    if '<pre>' in content:
-                        # JSON is wrapped in <pre> tags
-                        import re
-                        json_match = re.search(r'<pre[^>]*>(.*?)</pre>', content, re.DOTALL)
-                        if json_match:
-                            json_text = json_match.group(1)
-                            import json
-                            data = json.loads(json_text)
-                            await browser.close()
-                            return data
-                    
-                    # Try to get JSON directly
-                    try:
-                        json_text = await page.evaluate('document.body.innerText')
-                        import json
-                        data = json.loads(json_text)
-                        await browser.close()
-                        return data
-                    except:
-                        pass
+                if response.ok:
+                    return orjson.loads(await response.body())
                 
-                await browser.close()
-                self.logger.error(f"Browser API request failed: {response.status if response else 'No response'}")
+                self.logger.error(f"Browser API request failed: {response.status}")
                 return None
+            finally:
+                await context.close()
                 
         except Exception as e:
             self.logger.error(f"Browser API request error: {e}")
             return None
     
-    async def make_api_request(self, endpoint: str, params: dict, retry_count: int = 0) -> Optional[dict]:
+    def _build_url(self, endpoint_type: str, query: str, offset: int, limit: int, want_count: bool = True) -> URL:
+        """Build an already-encoded search URL so aiohttp doesn't parse/quote it on every call"""
+        return URL(
+            f"{self.endpoints[endpoint_type]}?count={'true' if want_count else 'false'}"
+            f"&q={self._encode_query(query)}&sr=%7CModifiedDate%7C{offset}%7C{limit}",
+            encoded=True
+        )
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _encode_query(query: str) -> str:
+        """Percent-encode a search query once, the same way aiohttp would encode it as a param"""
+        return URL.build(query={'q': query}).raw_query_string[len('q='):]
+    
+    @staticmethod
+    def _retry_delay(retry_count: int, retry_after: Optional[str] = None) -> float:
+        """Exponential backoff with jitter for request retries, honoring Retry-After when given"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60)
+        return min(2 ** retry_count, 30) + random.random()
+    
+    async def make_api_request(self, endpoint, params: Optional[dict] = None) -> Optional[dict]:
         """Make authenticated API request with retry logic"""
-        max_retries = 3
+        max_retries = self.config.get('api_integration', {}).get('max_retries', 3)
+        debug = self.logger.isEnabledFor(logging.DEBUG)  # Skip building per-request traces otherwise
         
-        try:
-            if not await self.ensure_authenticated():
-                raise Exception("Failed to authenticate")
-            
-            # Prepare cookies for request
-            cookie_string = '; '.join([f"{name}={value}" for name, value in self.session_cookies.items()])
-            headers = self.session_headers.copy()
-            headers['Cookie'] = cookie_string
-            
-            self.logger.debug(f"API Request: {endpoint}")
-            self.logger.debug(f"   Parameters: {params}")
-            self.logger.debug(f"   Headers count: {len(headers)}")
-            self.logger.debug(f"   Cookies count: {len(self.session_cookies)}")
-            
-            # Ensure session exists and is not closed
-            if not self.http_session or self.http_session.closed:
-                self.logger.warning("HTTP session is closed, recreating...")
-                await self.__aenter__()  # Recreate session
-            
-            async with self.http_session.get(
-                endpoint,
-                params=params,
-                headers=headers,
-                ssl=False,  # Disable SSL verification for potential proxy issues
-                allow_redirects=True
-            ) as response:
+        for retry_count in range(max_retries + 1):
+            retry_after = None
+            try:
+                if not self._auth_fresh() and not await self.ensure_authenticated():
+                    raise Exception("Failed to authenticate")
                 
-                self.logger.debug(f"   Status: {response.status}")
+                if debug:
+                    self.logger.debug("API Request: %s", endpoint)
+                    self.logger.debug("   Parameters: %s", params)
+                    self.logger.debug("   Headers count: %d", len(self.session_headers))
+                    self.logger.debug("   Cookies count: %d", len(self.session_cookies))
                 
-                if response.status == 200:
-                    data = await response.json()
-                    self.logger.debug(f"   Success! Response keys: {list(data.keys()) if isinstance(data, dict) else 'Not dict'}")
-                    return data
-                    
-                elif response.status == 407:
+                # Ensure session exists and is not closed
+                if not self.http_session or self.http_session.closed:
+                    self.logger.warning("HTTP session is closed, recreating...")
+                    await self.__aenter__()  # Recreate session
+                
+                await self._limiter.acquire()
+                
+                # Bound concurrent requests against api.encar.com; the semaphore is released
+                # before any browser fallback or retry backoff so waiting retries don't hold it
+                async with self._api_sem:
+                    async with self.http_session.get(
+                        endpoint,
+                        params=params,
+                        headers=self._request_headers,  # Cookies are attached from the session's cookie jar
+                        ssl=False,  # Disable SSL verification for potential proxy issues
+                        allow_redirects=True
+                    ) as response:
+                        
+                        status = response.status
+                        if debug:
+                            self.logger.debug("   Status: %s", status)
+                        
+                        if status == 200:
+                            if (response.content_length or 0) > MAX_RESPONSE_BYTES:
+                                raise Exception(f"Response too large: {response.content_length} bytes")
+                            data = orjson.loads(await self._read_capped(response))
+                            if debug:
+                                self.logger.debug("   Success! Response keys: %s", list(data.keys()) if isinstance(data, dict) else 'Not dict')
+                            return data
+                        
+                        retry_after = response.headers.get('Retry-After')
+                        # Error bodies are only logged, so read at most a small prefix
+                        response_text = (await response.content.read(ERROR_BODY_BYTES)).decode('utf-8', errors='replace')
+                
+                if status == 407:
                     self.logger.warning(f"Proxy authentication required (407) - trying browser fallback")
                     
                     # Try using browser to make the request directly
@@ -350,44 +649,44 @@ class EncarAPIClient:
                         self.logger.debug("Browser fallback successful!")
                         return browser_result
                     
-                    # If browser also fails, try re-auth
-                    if retry_count < max_retries:
-                        self.logger.debug(f"Retry {retry_count + 1}/{max_retries}: Re-extracting authentication...")
-                        self.auth_valid_until = None  # Force re-auth
-                        await asyncio.sleep(2)  # Wait before retry
-                        return await self.make_api_request(endpoint, params, retry_count + 1)
-                    else:
-                        self.logger.error("Max retries reached for 407 error")
-                        return None
-                        
-                elif response.status in [403, 401]:
-                    self.logger.warning(f"Authentication/Authorization failed ({response.status})")
-                    response_text = await response.text()
+                    # If browser also fails, re-auth and retry
+                    self.auth_valid_until = None  # Force re-auth
+                    self._direct_api_ok = False  # Direct access no longer enough, use the browser
+                    
+                elif status in [403, 401]:
+                    self.logger.warning(f"Authentication/Authorization failed ({status})")
+                    self._discard_saved_session()
                     self.logger.debug(f"Response body: {response_text[:500]}")
+                    self.auth_valid_until = None  # Force re-auth
+                    self._direct_api_ok = False  # Direct access no longer enough, use the browser
+                
+                elif status == 429:
+                    self.logger.warning("Rate limited by API (429)")
+                    
+                elif status in [500, 502, 503, 504]:
+                    self.logger.warning(f"API server error ({status})")
                     
-                    if retry_count < max_retries:
-                        self.logger.debug(f"Retry {retry_count + 1}/{max_retries}: Re-extracting authentication...")
-                        self.auth_valid_until = None  # Force re-auth
-                        await asyncio.sleep(2)
-                        return await self.make_api_request(endpoint, params, retry_count + 1)
-                    else:
-                        return None
-                        
                 else:
-                    self.logger.error(f"API request failed: {response.status}")
-                    response_text = await response.text()
+                    self.logger.error(f"API request failed: {status}")
                     self.logger.debug(f"Response body: {response_text[:500]}")
                     return None
-                    
-        except aiohttp.ClientProxyConnectionError as e:
-            self.logger.error(f"Proxy connection error: {e}")
-            return None
-        except aiohttp.ClientConnectorError as e:
-            self.logger.error(f"Connection error: {e}")
-            return None
-        except Exception as e:
-            self.logger.error(f"API request error: {e}")
-            return None
+                        
+            except aiohttp.ClientProxyConnectionError as e:
+                self.logger.error(f"Proxy connection error: {e}")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning(f"Connection error: {e!r}")
+                status = 'connection error'
+            except Exception as e:
+                self.logger.error(f"API request error: {e}")
+                return None
+            
+            if retry_count < max_retries:
+                self.logger.debug(f"Retry {retry_count + 1}/{max_retries}: backing off after {status}...")
+                await asyncio.sleep(self._retry_delay(retry_count, retry_after))
+        
+        self.logger.error(f"Max retries reached for {endpoint} (last status: {status})")
+        return None
     
     async def get_listings(self, offset: int = 0, limit: int = 20, endpoint_type: str = 'general', filters: dict = None) -> Tuple[List[Dict], int]:
         """Get car listings from API with optional filtering"""
@@ -397,27 +696,18 @@ class EncarAPIClient:
         try:
             query = self.build_api_query()
             
-            params = {
-                'count': 'true',
-                'q': query,
-                'sr': f'|ModifiedDate|{offset}|{limit}'
-            }
-            
-            endpoint = self.endpoints[endpoint_type]
-            data = await self.make_api_request(endpoint, params)
+            # Only the first page asks the server to compute the total; later pages reuse it
+            url = self._build_url(endpoint_type, query, offset, limit, want_count=offset == 0)
+            data = await self.make_api_request(url)
             
             if not data:
                 return [], 0
             
-            total_count = data.get('Count', 0)
+            total_count = self._remember_total(endpoint_type, query, data, counted=offset == 0)
             search_results = data.get('SearchResults', [])
             
             # Convert API response to our format
-            listings = []
-            for item in search_results:
-                listing = self.convert_api_item_to_listing(item)
-                if listing:
-                    listings.append(listing)
+            listings = self._convert_batch(search_results)
             
             self.logger.info(f"Retrieved {len(listings)} listings (page {offset//limit + 1})")
             return listings, total_count
@@ -431,27 +721,18 @@ class EncarAPIClient:
         try:
             query = self.build_api_query(filters)
             
-            params = {
-                'count': 'true',
-                'q': query,
-                'sr': f'|ModifiedDate|{offset}|{limit}'
-            }
-            
-            endpoint = self.endpoints['general']
-            data = await self.make_api_request(endpoint, params)
+            # Only the first page asks the server to compute the total; later pages reuse it
+            url = self._build_url('general', query, offset, limit, want_count=offset == 0)
+            data = await self.make_api_request(url)
             
             if not data:
                 return [], 0
             
-            total_count = data.get('Count', 0)
+            total_count = self._remember_total('general', query, data, counted=offset == 0)
             search_results = data.get('SearchResults', [])
             
             # Convert API response to our format
-            listings = []
-            for item in search_results:
-                listing = self.convert_api_item_to_listing(item)
-                if listing:
-                    listings.append(listing)
+            listings = self._convert_batch(search_results)
             
             self.logger.info(f"Retrieved {len(listings)} filtered listings (page {offset//limit + 1})")
             return listings, total_count
@@ -460,13 +741,42 @@ class EncarAPIClient:
             self.logger.error(f"Error getting filtered listings: {e}")
             return [], 0
     
-    def convert_api_item_to_listing(self, item: dict) -> Optional[dict]:
+    @staticmethod
+    async def _read_capped(response: aiohttp.ClientResponse) -> bytes:
+        """Read a response body, giving up once it exceeds MAX_RESPONSE_BYTES
+        
+        Chunked or compressed responses carry no usable Content-Length, so the cap is enforced
+        on the decoded bytes as they arrive.
+        """
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > MAX_RESPONSE_BYTES:
+                raise Exception(f"Response too large: over {MAX_RESPONSE_BYTES} bytes")
+        return bytes(body)
+    
+    def _remember_total(self, endpoint_type: str, query: str, data: dict, counted: bool = True) -> int:
+        """Cache the Count of a counted response, or fall back to the cached one for this endpoint and query"""
+        key = (endpoint_type, query)
+        if counted and 'Count' in data:
+            self._cached_totals[key] = data['Count']
+            return data['Count']
+        return self._cached_totals.get(key, 0)
+    
+    def _convert_batch(self, items: list) -> List[Dict]:
+        """Convert a page of API items, sharing one found_at timestamp across the page"""
+        now_iso = datetime.now().isoformat()
+        convert = self.convert_api_item_to_listing
+        return [listing for item in items if (listing := convert(item, now_iso))]
+    
+    def convert_api_item_to_listing(self, item: dict, now_iso: Optional[str] = None) -> Optional[dict]:
         """Convert API response item to our listing format with API-based lease detection"""
         try:
             # Extract basic info
             car_id = str(item.get('Id', ''))
-            model = item.get('Model', '')
-            badge = item.get('Badge', '')
+            # Model/badge/etc. repeat across most listings; interning shares one string object each
+            model = sys.intern(item.get('Model') or '')
+            badge = sys.intern(item.get('Badge') or '')
             year = item.get('Year', '')
             price_manwon = item.get('Price', 0)  # API returns prices in 만원
             mileage = item.get('Mileage', 0)
@@ -484,22 +794,12 @@ class EncarAPIClient:
             # Build title
             title = f"{model} {badge}".strip()
             
-            # API-based lease detection (heuristics)
-            is_lease = self.detect_lease_vehicle(item)
+            # Lease detection is disabled during the API phase (handled in Phase 2 with browser,
+            # see EncarScraperAPI); API-side detection would set these from the item, with
+            # true_price being the lease's total cost in millions
+            is_lease = False
             lease_info = None
-            
-            if is_lease:
-                lease_info = self.extract_lease_info(item)
-                # Convert lease prices from 만원 format to millions format
-                if lease_info:
-                    lease_info['deposit'] = lease_info.get('deposit', 0) / 100.0 if lease_info.get('deposit', 0) else 0
-                    lease_info['monthly_payment'] = lease_info.get('monthly_payment', 0) / 100.0 if lease_info.get('monthly_payment', 0) else 0
-                    lease_info['total_cost'] = lease_info.get('total_cost', 0) / 100.0 if lease_info.get('total_cost', 0) else 0
-                    true_price = lease_info.get('total_cost', price_millions)
-                else:
-                    true_price = price_millions
-            else:
-                true_price = price_millions
+            true_price = price_millions
             
             listing = {
                 'car_id': car_id,
@@ -514,13 +814,13 @@ class EncarAPIClient:
                 'is_coupe': is_coupe,
                 'is_lease': is_lease,  # Determined by API heuristics
                 'lease_info': lease_info,  # Estimated from API (will be refined in Phase 2)
-                'found_at': datetime.now().isoformat(),
+                'found_at': now_iso or datetime.now().isoformat(),
                 'api_source': True,
                 
                 # Additional API fields
-                'manufacturer': item.get('Manufacturer', ''),
-                'fuel_type': item.get('FuelType', ''),
-                'transmission': item.get('Transmission', ''),
+                'manufacturer': sys.intern(item.get('Manufacturer') or ''),
+                'fuel_type': sys.intern(item.get('FuelType') or ''),
+                'transmission': sys.intern(item.get('Transmission') or ''),
                 'modified_date': item.get('ModifiedDate', ''),
                 
                 # Placeholders for fields we'll get separately
@@ -536,41 +836,15 @@ class EncarAPIClient:
     
     def is_coupe_model(self, model: str, badge: str) -> bool:
         """Check if model is a coupe based on API data"""
-        model_lower = model.lower()
-        badge_lower = badge.lower()
-        
         # Check for explicit coupe indicators
-        coupe_keywords = ['쿠페', 'coupe']
-        
-        for keyword in coupe_keywords:
-            if keyword in model_lower or keyword in badge_lower:
-                return True
-        
-        return False
-    
-    def detect_lease_vehicle(self, item: dict) -> bool:
-        """Detect if a vehicle is likely a lease - DISABLED for API phase"""
-        # Disable lease detection during API phase - will be handled in Phase 2 with browser
-        return False
-    
-    def extract_lease_info(self, item: dict) -> Optional[dict]:
-        """Extract lease terms and calculate true total cost - DISABLED for API phase"""
-        # Disable lease detection during API phase - will be handled in Phase 2 with browser
-        return None
+        return bool(COUPE_RE.search(model) or COUPE_RE.search(badge))
     
     async def get_raw_api_data(self, limit: int = 5) -> List[Dict]:
         """Get raw API data without conversion (for testing)"""
         try:
             query = self.build_api_query()
             
-            params = {
-                'count': 'true',
-                'q': query,
-                'sr': f'|ModifiedDate|0|{limit}'
-            }
-            
-            endpoint = self.endpoints['general']
-            data = await self.make_api_request(endpoint, params)
+            data = await self.make_api_request(self._build_url('general', query, 0, limit))
             
             if not data:
                 return []
@@ -586,48 +860,96 @@ class EncarAPIClient:
         try:
             query = self.build_api_query()
             
-            params = {
-                'count': 'true',
-                'q': query
-            }
-            
-            data = await self.make_api_request(self.endpoints['general'], params)
+            # Ask for a single result so the response is essentially just the Count
+            data = await self.make_api_request(self._build_url('general', query, 0, 1))
             
             if data:
-                return data.get('Count', 0)
+                return self._remember_total('general', query, data)
             return 0
             
         except Exception as e:
             self.logger.error(f"Error getting total count: {e}")
             return 0
     
+    @staticmethod
+    def price_bucket_filters(edges: List[Optional[float]]) -> List[Dict]:
+        """Build the price_min/price_max filters for each bucket between consecutive edges
+        
+        Edges use the same price units as the price_min/price_max filters; None leaves a bucket
+        open-ended. The search API has no bucket aggregation, so each bucket is its own query.
+        """
+        bucket_filters = []
+        for low, high in zip(edges, edges[1:]):
+            filters = {}
+            if low:
+                filters['price_min'] = low
+            if high:
+                filters['price_max'] = high
+            bucket_filters.append(filters)
+        return bucket_filters
+    
+    async def iter_pages(self, max_pages: int = 5, limit: int = 20) -> AsyncIterator[Tuple[List[Dict], int]]:
+        """Yield (listings, total_count) page by page while the next few pages download concurrently
+        
+        Prefer `async for listings, total in client.iter_pages(...)` for large scrapes so only the
+        pages not yet consumed are held in memory.
+        """
+        # The first page also reports the total count, which tells us how many more pages exist
+        try:
+            listings, total_count = await self.get_listings(offset=0, limit=limit)
+        except Exception as e:
+            self.logger.warning(f"Error fetching page 1: {e}")
+            return
+        
+        if not total_count:
+            self.logger.warning("No listings reported by the API, stopping")
+            return
+        
+        # Read ahead only as many pages as can download at once, so at most that many
+        # unconsumed pages are held in memory however slowly the consumer reads
+        offsets = iter(range(limit, min(max_pages * limit, total_count), limit))
+        window = deque()
+        
+        def schedule_next():
+            offset = next(offsets, None)
+            if offset is not None:
+                window.append(asyncio.create_task(self.get_listings(offset=offset, limit=limit)))
+        
+        for _ in range(self.max_concurrent):
+            schedule_next()
+        
+        try:
+            yield listings, total_count
+            
+            page = 1
+            while window:
+                task = window.popleft()
+                page += 1
+                schedule_next()
+                try:
+                    listings, _ = await task
+                except Exception as e:
+                    self.logger.warning(f"Error fetching page {page}: {e}")
+                    continue
+                if not listings:
+                    self.logger.warning(f"No listings found on page {page}")
+                    continue
+                yield listings, total_count
+        finally:
+            # Stop downloading pages the consumer will no longer read
+            for task in window:
+                task.cancel()
+    
     async def get_multiple_pages(self, max_pages: int = 5, limit: int = 20) -> Tuple[List[Dict], int]:
-        """Get multiple pages of listings efficiently"""
+        """Get multiple pages of listings collected into one list (see iter_pages to stream them)"""
         all_listings = []
         total_count = 0
-        
-        for page in range(max_pages):
-            offset = page * limit
-            listings, count = await self.get_listings(offset=offset, limit=limit)
-            
-            if page == 0:  # Set total count from first page
-                total_count = count
-            
-            if not listings:
-                self.logger.warning(f"No listings found on page {page + 1}, stopping")
-                break
-                
+        pages = 0
+        async for listings, total_count in self.iter_pages(max_pages, limit):
             all_listings.extend(listings)
-            
-            # Check if we've reached the end
-            if len(listings) < limit:
-                self.logger.info(f"Reached end of listings at page {page + 1}")
-                break
-            
-            # Small delay between requests to be respectful
-            await asyncio.sleep(0.5)
+            pages += 1
         
-        self.logger.info(f"Retrieved {len(all_listings)} listings from {max_pages} pages")
+        self.logger.info(f"Retrieved {len(all_listings)} listings from {pages} pages")
         return all_listings, total_count
     
     async def test_api_connectivity(self) -> bool:
@@ -645,22 +967,15 @@ class EncarAPIClient:
                     'sr': '|ModifiedDate|0|5'
                 }
                 
-                # Simple headers without authentication
-                simple_headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'application/json, text/plain, */*',
-                    'Referer': 'http://www.encar.com/'
-                }
-                
                 async with self.http_session.get(
                     self.endpoints['general'],
                     params=params,
-                    headers=simple_headers,
+                    headers=DIRECT_API_HEADERS,
                     timeout=aiohttp.ClientTimeout(total=10)
                 ) as response:
                     self.logger.debug(f"Direct API test - Status: {response.status}")
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         count = data.get('Count', 0)
                         if count > 0:
                             self.logger.debug(f"✅ Direct API works! Total vehicles: {count}")
@@ -694,6 +1009,25 @@ class EncarAPIClient:
             return False
 
 
+# Shared client for long-running services: `async with EncarAPIClient(config)` suits one-shot
+# scripts, while get_client() keeps one HTTP session and auth state for the process lifetime
+_client: Optional[EncarAPIClient] = None
+
+async def get_client(config: dict) -> EncarAPIClient:
+    """Return the shared API client, opening its HTTP session on first use"""
+    global _client
+    if _client is None:
+        _client = EncarAPIClient(config)
+    return await _client.__aenter__()
+
+async def close_client():
+    """Close the shared API client if it was opened"""
+    global _client
+    if _client is not None:
+        await _client.__aexit__(None, None, None)
+        _client = None
+
+
 async def test_api_client():
     """Test the API client functionality"""
     print("Testing Encar API Client...")
@@ -5,20 +5,76 @@ Provides tools to narrow search criteria for precise car hunting
 """
 
 import asyncio
+import functools
+import heapq
+import json
 import logging
+import time
 import yaml
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from operator import itemgetter
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from encar_api_client import EncarAPIClient
 
+@functools.lru_cache(maxsize=4)
+def load_config(config_path: str) -> dict:
+    """Parse a YAML config once per path; instances share the resulting (read-only) dict"""
+    # The libyaml-backed loader is much faster when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(config_path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+# Car IDs whose detail page was already checked and showed a regular purchase (kept across runs)
+CONFIRMED_PURCHASES_PATH = Path(__file__).resolve().parent / "data" / "confirmed_purchases.json"
+# A listing's lease status is re-checked once its confirmation is this old, which also
+# keeps the file from growing forever as listings come and go
+CONFIRMED_PURCHASE_TTL = timedelta(days=30)
+
+def load_confirmed_purchases() -> Dict[str, str]:
+    """Load car IDs confirmed as purchase (non-lease) vehicles, mapped to the date confirmed"""
+    try:
+        stored = json.loads(CONFIRMED_PURCHASES_PATH.read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return {}
+    
+    today = datetime.now().date()
+    if isinstance(stored, list):  # Older files only listed the IDs
+        stored = dict.fromkeys(stored, today.isoformat())
+    
+    cutoff = (today - CONFIRMED_PURCHASE_TTL).isoformat()
+    return {car_id: confirmed for car_id, confirmed in stored.items() if confirmed >= cutoff}
+
+def save_confirmed_purchases(confirmed: Dict[str, str]):
+    """Persist the confirmed purchase car IDs with their confirmation dates"""
+    CONFIRMED_PURCHASES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    CONFIRMED_PURCHASES_PATH.write_text(json.dumps(confirmed, sort_keys=True), encoding='utf-8')
+
 class EncarFilterTools:
+    # quick_search type -> (method name, {method param: (quick_search kwarg, default)})
+    QUICK_SEARCHES = {
+        'recent': ('filter_recent_years', {'years_back': ('years', 3)}),
+        'budget': ('filter_budget_friendly', {'max_budget': ('budget', 5000)}),
+        'low_mileage': ('filter_low_mileage', {}),
+        'very_low_mileage': ('filter_very_low_mileage', {}),
+        'sweet_spot': ('filter_sweet_spot', {}),
+        'luxury': ('filter_premium_range', {'min_price': ('min_price', 7000)}),
+        'best_value': ('find_best_value', {})
+    }
+    
+    # Seconds a fetched (filters, limit) result is reused before querying the API again
+    FILTER_CACHE_TTL = 60
+    
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize filter tools with configuration"""
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         self.logger = logging.getLogger(__name__)
         self.api_client = None
+        self.lease_scraper = None
+        self._cache: Dict[tuple, Tuple[List[Dict], int, float]] = {}  # (filters, limit) -> (listings, total, fetched_at)
+        self._year = datetime.now().year
+        self._year_checked_at = time.monotonic()
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -28,8 +84,49 @@ class EncarFilterTools:
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.api_client:
-            await self.api_client.__aexit__(exc_type, exc_val, exc_tb)
+        try:
+            if self.api_client:
+                await self.api_client.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            # Close the lease browser even if the API client fails to shut down
+            if self.lease_scraper:
+                lease_scraper, self.lease_scraper = self.lease_scraper, None
+                await lease_scraper.__aexit__(exc_type, exc_val, exc_tb)
+    
+    async def _get_lease_scraper(self):
+        """Lease scraper shared by all lease checks, with its browser launched on first use"""
+        if self.lease_scraper is None:
+            # Imported lazily: the module is deprecated and warns on import
+            from lease_detail_scraper import LeaseDetailScraper
+            self.lease_scraper = await LeaseDetailScraper(self.config).__aenter__()
+        return self.lease_scraper
+    
+    def _current_year(self) -> int:
+        """Current year, re-read from the clock at most once a day"""
+        now = time.monotonic()
+        if now - self._year_checked_at > 86400:
+            self._year = datetime.now().year
+            self._year_checked_at = now
+        return self._year
+    
+    async def _cached_get(self, filters: Optional[dict], limit: int) -> Tuple[List[Dict], int]:
+        """Fetch listings for a filter set, reusing a result fetched within FILTER_CACHE_TTL
+        
+        The API's base query only matches GLE coupe badges, so results are already coupes.
+        """
+        key = (tuple(sorted(filters.items())) if filters else (), limit)
+        cached = self._cache.get(key)
+        if cached and time.monotonic() - cached[2] < self.FILTER_CACHE_TTL:
+            return list(cached[0]), cached[1]
+        
+        if filters:
+            listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
+        else:
+            listings, total = await self.api_client.get_listings(limit=limit)
+        
+        if listings:  # Don't cache failed/empty fetches
+            self._cache[key] = (listings, total, time.monotonic())
+        return list(listings), total
     
     # Year-based filtering
     async def filter_by_year_range(self, year_min: int = None, year_max: int = None, limit: int = 50) -> Tuple[List[Dict], int]:
@@ -41,14 +138,13 @@ class EncarFilterTools:
             filters['year_max'] = year_max
         
         self.logger.info(f"Filtering by year range: {year_min} - {year_max}")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
-        coupe_listings = [l for l in listings if l['is_coupe']]
+        coupe_listings, total = await self._cached_get(filters, limit=limit)
         
         return coupe_listings, total
     
     async def filter_recent_years(self, years_back: int = 3, limit: int = 50) -> Tuple[List[Dict], int]:
         """Filter vehicles from recent years only"""
-        current_year = datetime.now().year
+        current_year = self._current_year()
         year_min = current_year - years_back
         
         return await self.filter_by_year_range(year_min=year_min, limit=limit)
@@ -63,49 +159,48 @@ class EncarFilterTools:
             filters['price_max'] = price_max
         
         self.logger.info(f"Filtering by price range: {price_min} - {price_max} 만원 (include_lease: {include_lease})")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
-        coupe_listings = [l for l in listings if l['is_coupe']]
-        
-        # Filter by true price for lease vehicles
-        if price_min or price_max:
-            filtered_coupes = []
-            for listing in coupe_listings:
-                true_price = listing.get('true_price', listing.get('price', 0))
-                is_lease = listing.get('is_lease', False)
-                
-                # Skip lease vehicles if not included
-                if is_lease and not include_lease:
-                    continue
-                
-                # Check price range using true price
-                if price_min and true_price < price_min:
-                    continue
-                if price_max and true_price > price_max:
-                    continue
-                    
-                filtered_coupes.append(listing)
-            
-            coupe_listings = filtered_coupes
+        coupe_listings, total = await self._cached_get(filters, limit=limit)
+        
+        # The API already applied the price range to listed prices; only leases need re-checking
+        # (for their true cost, or to drop them when they're excluded even without a price range)
+        if price_min or price_max or not include_lease:
+            coupe_listings = [l for l in coupe_listings
+                              if self._passes_lease_filter(l, price_min, price_max, include_lease)]
         
         return coupe_listings, total
     
+    @staticmethod
+    def _passes_lease_filter(listing: Dict, price_min, price_max, include_lease: bool) -> bool:
+        """Residual checks the API query can't express: lease exclusion and a lease's true cost"""
+        if not listing.get('is_lease', False):
+            return True  # true_price equals the listed price, which the API already range-filtered
+        if not include_lease:
+            return False
+        
+        true_price = listing.get('true_price', listing.get('price', 0))
+        if price_min and true_price < price_min:
+            return False
+        if price_max and true_price > price_max:
+            return False
+        return True
+    
     async def filter_purchase_only(self, limit: int = 50) -> Tuple[List[Dict], int]:
         """Filter only purchase vehicles (exclude lease)"""
         self.logger.info("Filtering purchase-only vehicles (excluding lease)")
-        listings, total = await self.api_client.get_listings(limit=limit)
+        listings, total = await self._cached_get(None, limit=limit)
         
-        # Filter for coupes and non-lease vehicles only
-        purchase_listings = [l for l in listings if l['is_coupe'] and not l.get('is_lease', False)]
+        # Filter for non-lease vehicles only
+        purchase_listings = [l for l in listings if not l.get('is_lease', False)]
         
         return purchase_listings, total
     
     async def filter_lease_only(self, limit: int = 50) -> Tuple[List[Dict], int]:
         """Filter only lease vehicles"""
         self.logger.info("Filtering lease-only vehicles")
-        listings, total = await self.api_client.get_listings(limit=limit)
+        listings, total = await self._cached_get(None, limit=limit)
         
-        # Filter for coupes and lease vehicles only
-        lease_listings = [l for l in listings if l['is_coupe'] and l.get('is_lease', False)]
+        # Filter for lease vehicles only
+        lease_listings = [l for l in listings if l.get('is_lease', False)]
         
         return lease_listings, total
     
@@ -123,8 +218,7 @@ class EncarFilterTools:
         filters = {'mileage_max': max_mileage}
         
         self.logger.info(f"Filtering by max mileage: {max_mileage:,} km")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
-        coupe_listings = [l for l in listings if l['is_coupe']]
+        coupe_listings, total = await self._cached_get(filters, limit=limit)
         
         return coupe_listings, total
     
@@ -139,7 +233,7 @@ class EncarFilterTools:
     # Combined filtering
     async def filter_sweet_spot(self, max_price: int = 6000, max_years_old: int = 5, max_mileage: int = 80000, limit: int = 50) -> Tuple[List[Dict], int]:
         """Find the 'sweet spot' vehicles - good price, not too old, reasonable mileage"""
-        current_year = datetime.now().year
+        current_year = self._current_year()
         year_min = current_year - max_years_old
         
         filters = {
@@ -149,14 +243,13 @@ class EncarFilterTools:
         }
         
         self.logger.info(f"Sweet spot filter: Year {year_min}+, Price <={max_price}만원, Mileage <={max_mileage:,}km")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
-        coupe_listings = [l for l in listings if l['is_coupe']]
+        coupe_listings, total = await self._cached_get(filters, limit=limit)
         
         return coupe_listings, total
     
     async def filter_luxury_recent(self, min_price: int = 8000, max_years_old: int = 3, limit: int = 50) -> Tuple[List[Dict], int]:
         """Find luxury recent vehicles"""
-        current_year = datetime.now().year
+        current_year = self._current_year()
         year_min = current_year - max_years_old
         
         filters = {
@@ -165,8 +258,7 @@ class EncarFilterTools:
         }
         
         self.logger.info(f"Luxury recent filter: Year {year_min}+, Price >={min_price}만원")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit)
-        coupe_listings = [l for l in listings if l['is_coupe']]
+        coupe_listings, total = await self._cached_get(filters, limit=limit)
         
         return coupe_listings, total
     
@@ -175,35 +267,36 @@ class EncarFilterTools:
         """Analyze different market segments"""
         segments = {}
         
-        # Budget segment (under 4000만원)
-        budget_listings, budget_total = await self.filter_budget_friendly(4000, limit=100)
-        segments['budget'] = {
-            'count': len(budget_listings),
-            'total_available': budget_total,
-            'avg_price': sum(l.get('price', 0) for l in budget_listings) / len(budget_listings) if budget_listings else 0,
-            'avg_mileage': sum(l.get('mileage', 0) for l in budget_listings) / len(budget_listings) if budget_listings else 0
-        }
+        # Budget (under 4000만원), mid-range (4000-7000만원) and luxury (7000만원+), fetched
+        # concurrently through the filter cache so they share results with the price filters
+        edges = [None, 4000, 7000, None]
+        buckets = await asyncio.gather(
+            *(self._cached_get(filters, 100) for filters in self.api_client.price_bucket_filters(edges))
+        )
         
-        # Mid-range segment (4000-7000만원)
-        midrange_listings, midrange_total = await self.filter_by_price_range(4000, 7000, limit=100)
-        segments['midrange'] = {
-            'count': len(midrange_listings),
-            'total_available': midrange_total,
-            'avg_price': sum(l.get('price', 0) for l in midrange_listings) / len(midrange_listings) if midrange_listings else 0,
-            'avg_mileage': sum(l.get('mileage', 0) for l in midrange_listings) / len(midrange_listings) if midrange_listings else 0
-        }
-        
-        # Luxury segment (7000만원+)
-        luxury_listings, luxury_total = await self.filter_premium_range(7000, limit=100)
-        segments['luxury'] = {
-            'count': len(luxury_listings),
-            'total_available': luxury_total,
-            'avg_price': sum(l.get('price', 0) for l in luxury_listings) / len(luxury_listings) if luxury_listings else 0,
-            'avg_mileage': sum(l.get('mileage', 0) for l in luxury_listings) / len(luxury_listings) if luxury_listings else 0
-        }
+        for name, (listings, total), low, high in zip(('budget', 'midrange', 'luxury'), buckets, edges, edges[1:]):
+            # Lease listings are re-checked against the bucket's range using their true cost
+            listings = [l for l in listings if self._passes_lease_filter(l, low, high, True)]
+            segments[name] = self._segment_stats(listings, total)
         
         return segments
     
+    @staticmethod
+    def _segment_stats(listings: List[Dict], total: int) -> Dict:
+        """Count and average price/mileage of a segment in a single pass over its listings"""
+        price_sum = mileage_sum = 0
+        for listing in listings:
+            price_sum += listing.get('price', 0)
+            mileage_sum += listing.get('mileage', 0)
+        
+        count = len(listings)
+        return {
+            'count': count,
+            'total_available': total,
+            'avg_price': price_sum / count if count else 0,
+            'avg_mileage': mileage_sum / count if count else 0
+        }
+    
     async def find_best_value(self, limit: int = 20, include_lease: bool = False) -> List[Dict]:
         """Find best value vehicles (good price-to-features ratio) with lease options"""
         # Get recent, low-mileage vehicles under 6000만원
@@ -214,36 +307,25 @@ class EncarFilterTools:
         }
         
         self.logger.info(f"Finding best value vehicles (include_lease: {include_lease})...")
-        listings, total = await self.api_client.get_listings_with_filters(filters, limit=limit*3)
-        coupe_listings = [l for l in listings if l['is_coupe']]
+        coupe_listings, total = await self._cached_get(filters, limit=limit*3)
         
-        # Filter by true price and lease preference
-        filtered_listings = []
-        for listing in coupe_listings:
-            is_lease = listing.get('is_lease', False)
-            true_price = listing.get('true_price', listing.get('price', 0))
-            
-            # Skip lease vehicles if not included
-            if is_lease and not include_lease:
-                continue
-                
-            # Apply true price filter
-            if true_price > 6000:
-                continue
-                
-            filtered_listings.append(listing)
+        # Filter by true price and lease preference (the API already filtered listed prices)
+        filtered_listings = [l for l in coupe_listings
+                             if self._passes_lease_filter(l, None, 6000, include_lease)]
         
-        # Sort by price-to-year ratio (lower is better value)
+        # Score by price-to-year ratio (lower is better value)
         for listing in filtered_listings:
             year = listing.get('year', 2015)
-            true_price = listing.get('true_price', listing.get('price', 9999))
             if isinstance(year, (int, float)) and year > 2000:
+                true_price = listing.get('true_price')
+                if true_price is None:
+                    true_price = listing.get('price', 9999)
                 listing['value_score'] = true_price / max(year - 2000, 1)  # Simple value scoring
             else:
                 listing['value_score'] = 999  # High score for bad data
         
-        # Sort by value score and return top results
-        best_value = sorted(filtered_listings, key=lambda x: x.get('value_score', 999))[:limit]
+        # Only the top results are needed, so select them without sorting the whole list
+        best_value = heapq.nsmallest(limit, filtered_listings, key=itemgetter('value_score'))
         
         return best_value
     
@@ -256,7 +338,8 @@ class EncarFilterTools:
             print("No vehicles found matching criteria")
             return
         
-        print("\nTop results:")
+        # Collect the report and print it in one call
+        lines = ["\nTop results:"]
         for i, listing in enumerate(listings[:10], 1):
             year = listing.get('year', 'N/A')
             price = listing.get('price', 0)
@@ -266,7 +349,7 @@ class EncarFilterTools:
             listing_url = listing.get('listing_url', 'N/A')
             is_lease = listing.get('is_lease', False)
             
-            print(f"{i:2d}. {title_text}")
+            lines.append(f"{i:2d}. {title_text}")
             
             if is_lease:
                 lease_info = listing.get('lease_info', {})
@@ -274,19 +357,22 @@ class EncarFilterTools:
                 monthly = lease_info.get('monthly_payment', 0)
                 term = lease_info.get('lease_term_months', 0)
                 
-                print(f"    🚗 LEASE VEHICLE")
-                print(f"    💰 Listed: {price:,}만원 | TRUE COST: {true_price:,}만원")
+                lines.append(f"    🚗 LEASE VEHICLE")
+                lines.append(f"    💰 Listed: {price:,}만원 | TRUE COST: {true_price:,}만원")
                 if deposit and monthly and term:
-                    print(f"    📋 Lease: {deposit:,}만원 deposit + {monthly:,}만원×{term}months")
-                print(f"    📅 Year: {year} | 🛣️ Mileage: {mileage:,}km")
+                    lines.append(f"    📋 Lease: {deposit:,}만원 deposit + {monthly:,}만원×{term}months")
+                lines.append(f"    📅 Year: {year} | 🛣️ Mileage: {mileage:,}km")
             else:
-                print(f"    💰 Price: {price:,}만원 | 📅 Year: {year} | 🛣️ Mileage: {mileage:,}km")
+                lines.append(f"    💰 Price: {price:,}만원 | 📅 Year: {year} | 🛣️ Mileage: {mileage:,}km")
             
-            print(f"    🔗 URL: {listing_url}")
+            lines.append(f"    🔗 URL: {listing_url}")
             
-            if 'value_score' in listing:
-                print(f"    📊 Value Score: {listing['value_score']:.1f}")
-            print()  # Add blank line for better readability
+            value_score = listing.get('value_score')
+            if value_score is not None:
+                lines.append(f"    📊 Value Score: {value_score:.1f}")
+            lines.append("")  # Add blank line for better readability
+        
+        print("\n".join(lines))
     
     def print_market_analysis(self, segments: Dict):
         """Print market analysis results"""
@@ -300,107 +386,148 @@ class EncarFilterTools:
 
     def print_urls_only(self, listings: List[Dict], title: str, limit: int = 10):
         """Print only URLs for easy copying"""
-        print(f"\n=== {title} - URLs Only ===")
+        lines = [f"\n=== {title} - URLs Only ==="]
         for i, listing in enumerate(listings[:limit], 1):
             url = listing.get('listing_url', 'N/A')
             title_text = listing.get('title', 'Unknown')
             price = listing.get('price', 0)
-            print(f"{i:2d}. {title_text} ({price:,}만원)")
-            print(f"    {url}")
+            lines.append(f"{i:2d}. {title_text} ({price:,}만원)")
+            lines.append(f"    {url}")
+        print("\n".join(lines))
     
     def export_results_to_file(self, listings: List[Dict], filename: str, title: str):
         """Export filtering results to a text file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"=== {title} ===\n")
-            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Found {len(listings)} vehicles\n\n")
+        # Build the whole report first and write it in one call
+        parts = [
+            f"=== {title} ===\n",
+            f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Found {len(listings)} vehicles\n\n"
+        ]
+        
+        for i, listing in enumerate(listings, 1):
+            year = listing.get('year', 'N/A')
+            price = listing.get('price', 0)
+            mileage = listing.get('mileage', 0)
+            title_text = listing.get('title', 'Unknown')
+            listing_url = listing.get('listing_url', 'N/A')
             
-            for i, listing in enumerate(listings, 1):
-                year = listing.get('year', 'N/A')
-                price = listing.get('price', 0)
-                mileage = listing.get('mileage', 0)
-                title_text = listing.get('title', 'Unknown')
-                listing_url = listing.get('listing_url', 'N/A')
-                
-                f.write(f"{i:2d}. {title_text}\n")
-                f.write(f"    Year: {year} | Price: {price:,}만원 | Mileage: {mileage:,}km\n")
-                f.write(f"    URL: {listing_url}\n")
-                
-                if 'value_score' in listing:
-                    f.write(f"    Value Score: {listing['value_score']:.1f}\n")
-                f.write("\n")
+            parts.append(f"{i:2d}. {title_text}\n")
+            parts.append(f"    Year: {year} | Price: {price:,}만원 | Mileage: {mileage:,}km\n")
+            parts.append(f"    URL: {listing_url}\n")
+            
+            value_score = listing.get('value_score')
+            if value_score is not None:
+                parts.append(f"    Value Score: {value_score:.1f}\n")
+            parts.append("\n")
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
         
         print(f"Results exported to: {filename}")
     
     async def quick_search(self, search_type: str, **kwargs) -> List[Dict]:
         """Quick search with predefined filters"""
-        search_types = {
-            'recent': lambda: self.filter_recent_years(years_back=kwargs.get('years', 3)),
-            'budget': lambda: self.filter_budget_friendly(max_budget=kwargs.get('budget', 5000)),
-            'low_mileage': lambda: self.filter_low_mileage(),
-            'very_low_mileage': lambda: self.filter_very_low_mileage(),
-            'sweet_spot': lambda: self.filter_sweet_spot(),
-            'luxury': lambda: self.filter_premium_range(min_price=kwargs.get('min_price', 7000)),
-            'best_value': lambda: self.find_best_value()
-        }
-        
-        if search_type not in search_types:
-            print(f"Available search types: {list(search_types.keys())}")
+        if search_type not in self.QUICK_SEARCHES:
+            print(f"Available search types: {list(self.QUICK_SEARCHES.keys())}")
             return []
         
-        listings, total = await search_types[search_type]()
-        return listings
-
-    async def check_for_lease_vehicles(self, listings: List[Dict], max_checks: int = 10) -> List[Dict]:
-        """Check detail pages for potential lease vehicles"""
-        from lease_detail_scraper import LeaseDetailScraper
-        
-        # Initialize lease scraper
-        lease_scraper = LeaseDetailScraper(self.config)
+        method_name, params = self.QUICK_SEARCHES[search_type]
+        call_args = {param: kwargs.get(kwarg, default) for param, (kwarg, default) in params.items()}
+        result = await getattr(self, method_name)(**call_args)
         
-        updated_listings = []
-        check_count = 0
+        # Filters return (listings, total); find_best_value returns just the listings
+        return result[0] if isinstance(result, tuple) else result
+    
+    async def check_for_lease_vehicles(self, listings: List[Dict], max_checks: int = 10, concurrency: int = 4) -> List[Dict]:
+        """Check detail pages for potential lease vehicles (up to `concurrency` pages at a time)"""
+        async for _ in self.iter_lease_checks(listings, max_checks, concurrency):
+            pass
+        return list(listings)
+    
+    async def iter_lease_checks(self, listings: List[Dict], max_checks: int = 10, concurrency: int = 4) -> AsyncIterator[Dict]:
+        """Yield each listing as soon as its lease status is settled
+        
+        Listings that need no detail page come first; checked ones follow in completion order,
+        so consumers can print/save results while the remaining checks are still running.
+        """
+        lease_scraper = await self._get_lease_scraper()
+        # Vehicles confirmed as purchases on an earlier run don't need their detail page again
+        confirmed_purchases = load_confirmed_purchases()
+        today = datetime.now().date().isoformat()
+        known_count = len(confirmed_purchases)
+        
+        async def check_one(listing: Dict):
+            """Fetch one detail page and merge its lease status into the listing"""
+            self.logger.info(f"Checking vehicle {listing.get('car_id')} for lease status...")
+            try:
+                lease_details = await lease_scraper.extract_lease_details(listing['listing_url'])
+            except Exception as e:
+                self.logger.error(f"Error checking lease status for {listing.get('car_id')}: {e}")
+                # Default to not lease if we can't determine
+                listing['is_lease'] = False
+                listing['true_price'] = listing['price']
+                return
+            
+            if lease_details is None:
+                # Navigation or parsing failed; don't remember a guess, check again next run
+                self.logger.warning(f"⚠️ Could not determine lease status for {listing.get('car_id')}")
+                listing['is_lease'] = False
+                listing['true_price'] = listing['price']
+            elif lease_details.get('is_lease', False):
+                # Update the listing with lease information
+                listing['is_lease'] = True
+                listing['lease_info'] = lease_details
+                listing['true_price'] = lease_details.get('total_cost', listing['price'])
+                self.logger.info(f"✅ Vehicle {listing.get('car_id')} confirmed as LEASE")
+            else:
+                listing['is_lease'] = False
+                listing['true_price'] = listing['price']
+                self.logger.info(f"✅ Vehicle {listing.get('car_id')} confirmed as PURCHASE")
+                if listing.get('car_id') and lease_details.get('price_type') == 'purchase':
+                    confirmed_purchases[listing['car_id']] = today
         
+        pending = asyncio.Queue()
         for listing in listings:
-            if check_count >= max_checks:
+            if pending.qsize() >= max_checks:
                 # Don't check more than max_checks to avoid being too slow
-                updated_listings.append(listing)
+                yield listing
                 continue
-                
-            # Check if this listing should be investigated for lease status
-            should_check = self.should_check_for_lease(listing)
             
-            if should_check:
-                self.logger.info(f"Checking vehicle {listing.get('car_id')} for lease status...")
-                check_count += 1
-                
-                try:
-                    lease_details = await lease_scraper.extract_lease_details(listing['listing_url'])
-                    
-                    if lease_details and lease_details.get('is_lease', False):
-                        # Update the listing with lease information
-                        listing['is_lease'] = True
-                        listing['lease_info'] = lease_details
-                        listing['true_price'] = lease_details.get('total_cost', listing['price'])
-                        self.logger.info(f"✅ Vehicle {listing.get('car_id')} confirmed as LEASE")
-                    else:
-                        listing['is_lease'] = False
-                        listing['true_price'] = listing['price']
-                        self.logger.info(f"✅ Vehicle {listing.get('car_id')} confirmed as PURCHASE")
-                        
-                except Exception as e:
-                    self.logger.error(f"Error checking lease status for {listing.get('car_id')}: {e}")
-                    # Default to not lease if we can't determine
-                    listing['is_lease'] = False
-                    listing['true_price'] = listing['price']
+            # Check if this listing should be investigated for lease status
+            if listing.get('car_id') in confirmed_purchases:
+                listing['is_lease'] = False
+                listing['true_price'] = listing['price']
+            elif self.should_check_for_lease(listing):
+                pending.put_nowait(listing)
+                continue
             else:
                 # Default to not lease
                 listing['is_lease'] = False
                 listing['true_price'] = listing['price']
-            
-            updated_listings.append(listing)
+            yield listing
         
-        return updated_listings
+        # Each check renders a full detail page, so only a few workers run at a time
+        checked = asyncio.Queue()
+        
+        async def worker():
+            while not pending.empty():
+                listing = pending.get_nowait()
+                try:
+                    await check_one(listing)
+                finally:
+                    await checked.put(listing)  # Always hand the listing on so the consumer never stalls
+        
+        check_count = pending.qsize()
+        workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, check_count))]
+        try:
+            for _ in range(check_count):
+                yield await checked.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            # Persist even when the consumer stops early and closes the generator
+            if len(confirmed_purchases) > known_count:
+                save_confirmed_purchases(confirmed_purchases)
     
     def should_check_for_lease(self, listing: Dict) -> bool:
         """Determine if a listing should be checked for lease status"""
@@ -416,7 +543,9 @@ class EncarFilterTools:
             return True
             
         # Check cars with suspiciously round prices (might be estimates)
-        if price % 100 == 0 or str(price).endswith('77'):  # Like 5177 in user's example
+        # Last two digits as written: 5177 (만원) or 51.77 (millions) both end in 77
+        last_digits = price % 100 if isinstance(price, int) else round(price * 100) % 100
+        if price % 100 == 0 or last_digits == 77:  # Like 5177 in user's example
             return True
             
         return False
@@ -18,7 +18,6 @@ warnings.warn(
 import asyncio
 import logging
 import schedule
-import time
 import yaml
 from datetime import datetime, timedelta
 from typing import List, Dict
@@ -37,6 +36,14 @@ class EncarMonitor:
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = yaml.safe_load(f)
         
+        # Resolve settings used on every cycle once
+        monitoring = self.config['monitoring']
+        self.max_pages = monitoring.get('max_pages_to_scan', 5)  # Not in config.template.yaml
+        self.initial_population_pages = monitoring.get('initial_population_pages', 20)
+        self.check_interval_minutes = monitoring['check_interval_minutes']
+        self.backup_days = self.config['database']['backup_days']
+        self.immediate_threshold = self.config['new_listing_criteria'].get('immediate_alert_views', 10)
+        
         # Initialize components
         self.scraper = EncarScraper(config_path)
         self.database = EncarDatabase(self.config['database']['filename'])
@@ -47,6 +54,10 @@ class EncarMonitor:
         self.start_time = datetime.now()
         self.check_count = 0
         self.total_new_listings = 0
+        self._first_run_done = False
+        self._loop = None
+        self._wakeup = None
+        self._jobs = {}
         
         # Set up logging
         self.setup_logging()
@@ -69,9 +80,18 @@ class EncarMonitor:
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
-        self.logger.info(f"Received signal {signum}. Shutting down gracefully...")
+        self.logger.info("Received signal %s. Shutting down gracefully...", signum)
         self.is_running = False
-        sys.exit(0)
+        if self._loop is None:
+            sys.exit(0)
+        # Wake the scheduler so it exits without waiting for the next job
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+    
+    def _is_first_run(self) -> bool:
+        """Check for an unpopulated database, remembering once it has been populated."""
+        if not self._first_run_done:
+            self._first_run_done = not self.database.is_first_run()
+        return not self._first_run_done
     
     async def run_monitoring_cycle(self):
         """Run a single monitoring cycle with the new architecture."""
@@ -80,7 +100,7 @@ class EncarMonitor:
             self.check_count += 1
             
             # Check if this is the first run (database is empty)
-            is_first_run = self.database.is_first_run()
+            is_first_run = self._is_first_run()
             
             if is_first_run:
                 self.logger.info("🆕 First run detected - performing initial database population")
@@ -88,8 +108,7 @@ class EncarMonitor:
                 return
             
             # Regular monitoring scan
-            max_pages = self.config['monitoring']['max_pages_to_scan']
-            listings = await self.scraper.scrape_multiple_pages(max_pages)
+            listings = await self.scraper.scrape_multiple_pages(self.max_pages)
             
             if not listings:
                 self.logger.warning("No listings found in this cycle")
@@ -97,19 +116,13 @@ class EncarMonitor:
                 return
             
             # Process listings with the new architecture
-            new_count = 0
-            updated_count = 0
             total_scanned = len(listings)
+            counts = self.database.save_listings_batch(listings, self.config, collect_truly_new=True)
+            new_count = counts['new']
+            updated_count = counts['updated']
             
-            for listing in listings:
-                result = self.database.save_listing(listing, self.config)
-                if result == 'new':
-                    new_count += 1
-                elif result == 'updated':
-                    updated_count += 1
-            
-            # Get truly new listings for notifications
-            truly_new_listings = self.database.get_truly_new_listings(self.config)
+            # Truly new listings for notifications come straight from the save
+            truly_new_listings = counts['truly_new']
             recent_registrations = self.database.get_recent_registrations(7)  # Last 7 days
             
             # Log monitoring action
@@ -131,23 +144,21 @@ class EncarMonitor:
                 }
                 
                 self.notifier.send_batch_alert(truly_new_listings, summary_stats)
-                self.logger.info(f"Sent notifications for {len(truly_new_listings)} truly new listings")
+                self.logger.info("Sent notifications for %d truly new listings", len(truly_new_listings))
                 self.total_new_listings += len(truly_new_listings)
             
             # Also check for immediate alerts (very fresh listings)
-            immediate_threshold = self.config['new_listing_criteria'].get('immediate_alert_views', 10)
-            immediate_alerts = [l for l in truly_new_listings if l.get('views', 0) <= immediate_threshold]
+            immediate_alerts = [l for l in truly_new_listings if l.get('views', 0) <= self.immediate_threshold]
             
             if immediate_alerts:
                 for listing in immediate_alerts:
                     self.notifier.send_new_listing_alert(listing)
-                    self.logger.info(f"Immediate alert: {listing['title']} ({listing['views']} views)")
+                    self.logger.info("Immediate alert: %s (%s views)", listing['title'], listing['views'])
             
             # Log summary
             self.logger.info(
-                f"Cycle {self.check_count} completed: "
-                f"{total_scanned} scanned, {new_count} new in DB, {len(truly_new_listings)} truly new, "
-                f"{len(recent_registrations)} recent registrations"
+                "Cycle %d completed: %d scanned, %d new in DB, %d truly new, %d recent registrations",
+                self.check_count, total_scanned, new_count, len(truly_new_listings), len(recent_registrations)
             )
             
         except Exception as e:
@@ -163,8 +174,8 @@ class EncarMonitor:
             self.notifier.send_monitoring_status("INITIAL_POPULATION", "Populating database with existing listings")
             
             # Use detailed scraping for initial population
-            max_pages = self.config['monitoring'].get('initial_population_pages', 20)
-            self.logger.info(f"Scanning {max_pages} pages for initial population...")
+            max_pages = self.initial_population_pages
+            self.logger.info("Scanning %s pages for initial population...", max_pages)
             
             listings = await self.scraper.scrape_with_details(max_pages, is_initial_population=True)
             
@@ -173,14 +184,11 @@ class EncarMonitor:
                 return
             
             # Save all listings to database
-            saved_count = 0
-            for listing in listings:
-                result = self.database.save_listing(listing, self.config)
-                if result == 'new':
-                    saved_count += 1
+            saved_count = self.database.save_listings_batch(listings, self.config)['new']
             
             # Mark initial population as complete
             self.database.mark_initial_population_complete()
+            self._first_run_done = True
             
             # Log the initial population
             self.database.log_monitoring_action(
@@ -190,7 +198,7 @@ class EncarMonitor:
                 len(listings)
             )
             
-            self.logger.info(f"✅ Initial population completed: {saved_count} listings saved")
+            self.logger.info("✅ Initial population completed: %d listings saved", saved_count)
             self.notifier.send_monitoring_status(
                 "POPULATION_COMPLETE", 
                 f"Database populated with {saved_count} listings. Monitoring will begin on next cycle."
@@ -211,20 +219,15 @@ class EncarMonitor:
             
             new_count = 0  # Initialize before conditional block
             if listings:
-                for listing in listings:
-                    result = self.database.save_listing(listing, self.config)
-                    if result == 'new':
-                        new_count += 1
-                
-                # Check for truly new listings
-                truly_new = self.database.get_truly_new_listings(self.config)
+                counts = self.database.save_listings_batch(listings, self.config, collect_truly_new=True)
+                new_count = counts['new']
+                truly_new = counts['truly_new']
                 
                 # Send immediate alerts for very fresh listings
-                immediate_threshold = self.config['new_listing_criteria'].get('immediate_alert_views', 10)
                 for listing in truly_new:
-                    if listing.get('views', 0) <= immediate_threshold:
+                    if listing.get('views', 0) <= self.immediate_threshold:
                         self.notifier.send_new_listing_alert(listing)
-                        self.logger.info(f"Quick scan alert: {listing['title']} ({listing['views']} views)")
+                        self.logger.info("Quick scan alert: %s (%s views)", listing['title'], listing['views'])
             
             self.database.log_monitoring_action(
                 "quick_scan", 
@@ -234,18 +237,17 @@ class EncarMonitor:
             )
             
         except Exception as e:
-            self.logger.error(f"Error in quick scan: {e}")
+            self.logger.error("Error in quick scan: %s", e)
             self.notifier.send_error_alert(str(e), "quick_scan")
     
     def cleanup_old_data(self):
         """Clean up old data from database."""
         try:
-            backup_days = self.config['database']['backup_days']
-            self.database.cleanup_old_data(backup_days)
-            self.logger.info(f"Cleaned up data older than {backup_days} days")
+            self.database.cleanup_old_data(self.backup_days)
+            self.logger.info("Cleaned up data older than %s days", self.backup_days)
             
         except Exception as e:
-            self.logger.error(f"Error cleaning up data: {e}")
+            self.logger.error("Error cleaning up data: %s", e)
     
     def generate_daily_summary(self):
         """Generate and send enhanced daily summary."""
@@ -256,29 +258,39 @@ class EncarMonitor:
             stats['new_listings_found'] = self.total_new_listings
             
             # Enhanced summary with new metrics
-            summary = f"\n📈 DAILY ENCAR MONITORING SUMMARY - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            summary += f"{'='*60}\n"
-            summary += f"🔍 Monitoring Stats:\n"
-            summary += f"   • Total monitoring cycles: {stats['total_cycles']}\n"
-            summary += f"   • System uptime: {stats['uptime']}\n"
-            summary += f"   • Last check: {stats.get('last_check', 'N/A')}\n"
-            summary += f"\n📊 Database Stats:\n"
-            summary += f"   • Total listings tracked: {stats.get('total_listings', 0)}\n"
-            summary += f"   • Coupe listings: {stats.get('coupe_listings', 0)}\n"
-            summary += f"   • Truly new listings: {stats.get('truly_new_listings', 0)}\n"
-            summary += f"   • Recent registrations (7 days): {stats.get('recent_registrations', 0)}\n"
-            summary += f"   • Low view listings: {stats.get('low_view_listings', 0)}\n"
+            rule = '=' * 60
+            lines = [
+                "",
+                f"📈 DAILY ENCAR MONITORING SUMMARY - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                rule,
+                "🔍 Monitoring Stats:",
+                f"   • Total monitoring cycles: {stats['total_cycles']}",
+                f"   • System uptime: {stats['uptime']}",
+                f"   • Last check: {stats.get('last_check', 'N/A')}",
+                "",
+                "📊 Database Stats:",
+                f"   • Total listings tracked: {stats.get('total_listings', 0)}",
+                f"   • Coupe listings: {stats.get('coupe_listings', 0)}",
+                f"   • Truly new listings: {stats.get('truly_new_listings', 0)}",
+                f"   • Recent registrations (7 days): {stats.get('recent_registrations', 0)}",
+                f"   • Low view listings: {stats.get('low_view_listings', 0)}",
+            ]
             if stats.get('avg_registration_age_days'):
-                summary += f"   • Avg registration age: {stats['avg_registration_age_days']} days\n"
-            summary += f"\n🚗 New Findings Today:\n"
-            summary += f"   • New listings discovered: {stats['new_listings_found']}\n"
-            summary += f"{'='*60}\n"
+                lines.append(f"   • Avg registration age: {stats['avg_registration_age_days']} days")
+            lines += [
+                "",
+                "🚗 New Findings Today:",
+                f"   • New listings discovered: {stats['new_listings_found']}",
+                rule,
+                "",
+            ]
+            summary = "\n".join(lines)
             
             self.notifier.send_console_alert(summary)
             self.logger.info("Enhanced daily summary generated")
             
         except Exception as e:
-            self.logger.error(f"Error generating daily summary: {e}")
+            self.logger.error("Error generating daily summary: %s", e)
     
     def get_status(self) -> Dict:
         """Get current monitoring status with enhanced metrics."""
@@ -292,8 +304,8 @@ class EncarMonitor:
             'new_listings_found': self.total_new_listings,
             'last_check': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'database_stats': db_stats,
-            'is_first_run': self.database.is_first_run(),
-            'monitoring_mode': 'initial_population' if self.database.is_first_run() else 'regular_monitoring'
+            'is_first_run': self._is_first_run(),
+            'monitoring_mode': 'initial_population' if self._is_first_run() else 'regular_monitoring'
         }
     
     def print_status(self):
@@ -326,24 +338,22 @@ class EncarMonitor:
         self.notifier.send_monitoring_status("STARTING", "Initializing monitoring system")
         
         # Set up monitoring schedule
-        interval = self.config['monitoring']['check_interval_minutes']
-        schedule.every(interval).minutes.do(self.run_monitoring_job)
+        interval = self.check_interval_minutes
+        schedule.every(interval).minutes.do(self._spawn_job, self.run_monitoring_cycle)
         
         # Set up daily tasks
         schedule.every().day.at("08:00").do(self.daily_summary_job)
         schedule.every().day.at("02:00").do(self.cleanup_job)
         
         # Set up quick scans (every 5 minutes)
-        schedule.every(5).minutes.do(self.quick_scan_job)
+        schedule.every(5).minutes.do(self._spawn_job, self.run_quick_scan)
         
         self.is_running = True
-        self.logger.info(f"Monitoring started with {interval}-minute intervals")
+        self.logger.info("Monitoring started with %s-minute intervals", interval)
         self.notifier.send_monitoring_status("STARTED", f"Checking every {interval} minutes")
         
         try:
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(30)  # Check every 30 seconds
+            asyncio.run(self._scheduler_loop())
                 
         except KeyboardInterrupt:
             self.logger.info("Monitoring stopped by user")
@@ -351,19 +361,47 @@ class EncarMonitor:
             self.is_running = False
             self.notifier.send_monitoring_status("STOPPED", "Monitoring system shut down")
     
-    def run_monitoring_job(self):
-        """Wrapper for async monitoring cycle."""
+    async def _scheduler_loop(self):
+        """Run scheduled jobs on one event loop, sleeping until the next is due."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        
         try:
-            asyncio.run(self.run_monitoring_cycle())
-        except Exception as e:
-            self.logger.error(f"Error in monitoring job: {e}")
+            # One browser serves every cycle instead of a launch per job
+            async with self.scraper:
+                try:
+                    while self.is_running:
+                        schedule.run_pending()
+                        
+                        idle = schedule.idle_seconds()
+                        timeout = 300 if idle is None else min(max(idle, 0), 300)
+                        try:
+                            await asyncio.wait_for(self._wakeup.wait(), timeout)
+                        except asyncio.TimeoutError:
+                            pass
+                finally:
+                    for task in self._jobs.values():
+                        task.cancel()
+                    await asyncio.gather(*self._jobs.values(), return_exceptions=True)
+                    self._jobs.clear()
+        finally:
+            self._loop = None
     
-    def quick_scan_job(self):
-        """Wrapper for async quick scan."""
-        try:
-            asyncio.run(self.run_quick_scan())
-        except Exception as e:
-            self.logger.error(f"Error in quick scan job: {e}")
+    def _spawn_job(self, job):
+        """Start an async job as a task unless its previous run is still going."""
+        running = self._jobs.get(job.__name__)
+        if running and not running.done():
+            self.logger.warning("Skipping %s: previous run still in progress", job.__name__)
+            return
+        
+        task = asyncio.create_task(job())
+        task.add_done_callback(self._job_finished)
+        self._jobs[job.__name__] = task
+    
+    def _job_finished(self, task):
+        """Log failures from scheduled job tasks."""
+        if not task.cancelled() and task.exception():
+            self.logger.error("Error in scheduled job: %s", task.exception())
     
     def daily_summary_job(self):
         """Daily summary job."""
@@ -377,7 +415,7 @@ class EncarMonitor:
         """Run a single monitoring check (for testing) with new architecture."""
         self.logger.info("Running single monitoring check...")
         
-        if self.database.is_first_run():
+        if self._is_first_run():
             self.logger.info("First run - will perform initial population")
             await self.run_initial_population()
         else:
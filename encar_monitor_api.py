@@ -12,13 +12,13 @@ import signal
 import sys
 import io
 import os
-import re
+from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict
 from dotenv import load_dotenv
 from encar_scraper_api import EncarScraperAPI
 from data_storage import EncarDatabase
-from notification import NotificationManager
+from notification import NotificationManager, ENV_VAR_PATTERN
 from closure_scanner import ClosureScanner
 
 class EncarMonitorAPI:
@@ -72,8 +72,7 @@ class EncarMonitorAPI:
         """Load config file with environment variable substitution"""
         try:
             # Read config file
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config_content = f.read()
+            config_content = Path(config_path).read_text(encoding='utf-8')
             
             # Replace environment variable placeholders
             config_content = self._substitute_env_vars(config_content)
@@ -118,9 +117,7 @@ class EncarMonitorAPI:
                 return defaults.get(var_name, match.group(0))
             return env_value
         
-        # Pattern to match ${VARIABLE_NAME}
-        pattern = r'\$\{([A-Z_][A-Z0-9_]*)\}'
-        return re.sub(pattern, replace_var, config_content)
+        return ENV_VAR_PATTERN.sub(replace_var, config_content)
     
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
@@ -19,6 +19,7 @@ import asyncio
 import re
 import logging
 import time
+from contextlib import asynccontextmanager
 from typing import List, Dict, Optional
 from urllib.parse import quote
 from playwright.async_api import async_playwright
@@ -30,8 +31,61 @@ class EncarScraper:
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = yaml.safe_load(f)
         
+        self.playwright = None
         self.browser = None
         self.page = None
+        self._persistent = False
+        self._page_lock = asyncio.Lock()
+    
+    async def __aenter__(self):
+        """Keep one browser open across scrapes until the context exits."""
+        if not self._persistent:
+            self._persistent = True
+            try:
+                await self.start_browser()
+            except Exception:
+                # Each scrape relaunches a missing browser, so just try again then
+                logging.warning("Shared browser failed to start; will retry on next scrape")
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared browser."""
+        if self._persistent:
+            self._persistent = False
+            await self.close_browser()
+    
+    @asynccontextmanager
+    async def _browser_session(self):
+        """Use the shared browser if one is open, otherwise a temporary one."""
+        if self._persistent:
+            # Scrapes share a single page, so run them one at a time
+            async with self._page_lock:
+                await self._ensure_live_browser()
+                yield
+            return
+        
+        try:
+            await self.start_browser()
+            yield
+        finally:
+            await self.close_browser()
+    
+    def _browser_alive(self) -> bool:
+        """Check that the shared browser and its page are still usable."""
+        return (
+            self.browser is not None and self.browser.is_connected() and
+            self.page is not None and not self.page.is_closed()
+        )
+    
+    async def _ensure_live_browser(self):
+        """Relaunch the shared browser if it never started or has crashed."""
+        if self._browser_alive():
+            return
+        
+        if self.browser is not None:
+            logging.warning("Shared browser is no longer connected, relaunching")
+        await self.close_browser()
+        await self.start_browser()
         
     async def start_browser(self):
         """Start the browser session."""
@@ -49,6 +103,8 @@ class EncarScraper:
             
         except Exception as e:
             logging.error(f"Error starting browser: {e}")
+            # Don't leave a half-started Playwright driver behind
+            await self.close_browser()
             raise
     
     async def close_browser(self):
@@ -58,11 +114,20 @@ class EncarScraper:
                 await self.page.close()
             if self.browser:
                 await self.browser.close()
-            if hasattr(self, 'playwright'):
-                await self.playwright.stop()
                 
         except Exception as e:
             logging.error(f"Error closing browser: {e}")
+        finally:
+            # A crashed browser can fail to close; still stop the driver and
+            # drop the stale handles so the next start is clean
+            self.page = None
+            self.browser = None
+            playwright, self.playwright = self.playwright, None
+            if playwright:
+                try:
+                    await playwright.stop()
+                except Exception as e:
+                    logging.error(f"Error stopping Playwright: {e}")
     
     def build_search_url(self, page_num: int = 1) -> str:
         """Build the search URL with filters."""
@@ -300,8 +365,7 @@ class EncarScraper:
         """Scrape multiple pages of search results."""
         all_listings = []
         
-        try:
-            await self.start_browser()
+        async with self._browser_session():
             
             # Use more pages for initial population
             if is_initial_population:
@@ -330,9 +394,6 @@ class EncarScraper:
             
             logging.info(f"Total listings found: {len(all_listings)}")
             return all_listings
-            
-        finally:
-            await self.close_browser()
     
     async def scrape_with_details(self, max_pages: int = 5, is_initial_population: bool = False) -> List[Dict]:
         """
@@ -341,8 +402,7 @@ class EncarScraper:
         """
         all_listings = []
         
-        try:
-            await self.start_browser()
+        async with self._browser_session():
             
             # Use more pages for initial population
             if is_initial_population:
@@ -388,21 +448,14 @@ class EncarScraper:
             
             logging.info(f"Total detailed listings found: {len(all_listings)}")
             return all_listings
-            
-        finally:
-            await self.close_browser()
     
     async def get_quick_scan(self) -> List[Dict]:
         """Quick scan of just the first page for new listings."""
-        try:
-            await self.start_browser()
+        async with self._browser_session():
             listings = await self.get_listings_from_page(1)
             filtered_listings = self.filter_listings(listings)
             
             return filtered_listings
-            
-        finally:
-            await self.close_browser()
 
 # Enhanced utility functions
 async def run_initial_population():
@@ -56,16 +56,15 @@ class EncarScraperAPI:
         try:
             self.logger.info(f"Scraping up to {max_pages} pages...")
             
-            # Get all listings at once using the API client's efficient method
-            all_listings, total_count = await self.api_client.get_multiple_pages(
-                max_pages=max_pages, 
-                limit=20
-            )
-            
-            # Filter for coupe models only
-            coupe_listings = [listing for listing in all_listings if listing['is_coupe']]
+            # Stream pages from the API client, keeping only coupe models as each page arrives
+            coupe_listings = []
+            listing_count = 0
+            total_count = 0
+            async for listings, total_count in self.api_client.iter_pages(max_pages=max_pages, limit=20):
+                listing_count += len(listings)
+                coupe_listings.extend(listing for listing in listings if listing['is_coupe'])
             
-            self.logger.info(f"Retrieved {len(all_listings)} total listings, {len(coupe_listings)} coupes")
+            self.logger.info(f"Retrieved {listing_count} total listings, {len(coupe_listings)} coupes")
             self.logger.info(f"Total available vehicles: {total_count}")
             
             return coupe_listings
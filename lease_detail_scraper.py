@@ -26,49 +26,86 @@ class LeaseDetailScraper:
     def __init__(self, config: dict):
         self.config = config
         self.logger = logging.getLogger(__name__)
+        self._pw = None
+        self.browser = None  # Shared browser while used as an async context manager
+    
+    async def __aenter__(self):
+        """Launch one browser that every extraction reuses (a fresh context per page)"""
+        self._pw = await async_playwright().start()
+        try:
+            self.browser = await self._pw.chromium.launch(
+                headless=self.config['browser']['headless']
+            )
+        except Exception:
+            # Don't leave the Playwright driver running without a browser
+            await self._pw.stop()
+            self._pw = None
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the shared browser"""
+        try:
+            if self.browser:
+                browser, self.browser = self.browser, None
+                await browser.close()
+        finally:
+            if self._pw:
+                pw, self._pw = self._pw, None
+                await pw.stop()
     
     async def extract_lease_details(self, listing_url: str) -> Optional[Dict]:
         """Extract complete lease details from vehicle detail page"""
         try:
             self.logger.info(f"Extracting lease details from: {listing_url}")
             
+            if self.browser:
+                context = await self.browser.new_context()
+                try:
+                    return await self._extract_from_context(context, listing_url)
+                finally:
+                    await context.close()
+            
             async with async_playwright() as p:
                 browser = await p.chromium.launch(
                     headless=self.config['browser']['headless']
                 )
-                context = await browser.new_context()
-                page = await context.new_page()
-                
-                # Navigate to the detail page
-                await page.goto(listing_url)
-                await page.wait_for_timeout(3000)
-                
-                # Check if this is a lease vehicle
-                is_lease = await self.detect_lease_on_page(page)
-                
-                if not is_lease:
+                try:
+                    return await self._extract_from_context(await browser.new_context(), listing_url)
+                finally:
                     await browser.close()
-                    return {
-                        'is_lease': False,
-                        'price_type': 'purchase'
-                    }
-                
-                # Extract lease details
-                lease_details = await self.extract_lease_terms(page)
-                
-                await browser.close()
-                
-                if lease_details:
-                    lease_details['is_lease'] = True
-                    lease_details['price_type'] = 'lease'
-                    self.logger.info(f"Extracted lease details: {lease_details}")
-                
-                return lease_details
                 
         except Exception as e:
             self.logger.error(f"Error extracting lease details from {listing_url}: {e}")
             return None
     
+    async def _extract_from_context(self, context, listing_url: str) -> Optional[Dict]:
+        """Load the detail page in the given browser context and read its lease terms"""
+        page = await context.new_page()
+        
+        # Navigate to the detail page
+        await page.goto(listing_url)
+        await page.wait_for_timeout(3000)
+        
+        # Check if this is a lease vehicle
+        is_lease = await self.detect_lease_on_page(page)
+        
+        if not is_lease:
+            return {
+                'is_lease': False,
+                'price_type': 'purchase'
+            }
+        
+        # Extract lease details
+        lease_details = await self.extract_lease_terms(page)
+        
+        if lease_details:
+            lease_details['is_lease'] = True
+            lease_details['price_type'] = 'lease'
+            self.logger.info(f"Extracted lease details: {lease_details}")
+        
+        return lease_details
+    
     async def detect_lease_on_page(self, page) -> bool:
         """Detect if the vehicle page shows lease terms"""
         try:
@@ -1,5 +1,6 @@
 import logging
 import aiohttp
+import orjson
 import asyncio
 from datetime import datetime
 from typing import List, Dict
@@ -8,8 +9,12 @@ import time
 import html
 import os
 import re
+from pathlib import Path
 from dotenv import load_dotenv
 
+# Pattern to match ${VARIABLE_NAME}
+ENV_VAR_PATTERN = re.compile(r'\$\{([A-Z_][A-Z0-9_]*)\}')
+
 class NotificationManager:
     def __init__(self, config_path: str = "config.yaml"):
         """Initialize notification manager with configuration."""
@@ -17,8 +22,7 @@ class NotificationManager:
         load_dotenv()
         
         # Read config file
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_content = f.read()
+        config_content = Path(config_path).read_text(encoding='utf-8')
         
         # Replace environment variable placeholders
         config_content = self._substitute_env_vars(config_content)
@@ -46,9 +50,7 @@ class NotificationManager:
                 return match.group(0)  # Return original placeholder
             return env_value
         
-        # Pattern to match ${VARIABLE_NAME}
-        pattern = r'\$\{([A-Z_][A-Z0-9_]*)\}'
-        return re.sub(pattern, replace_var, config_content)
+        return ENV_VAR_PATTERN.sub(replace_var, config_content)
     
     def setup_file_logging(self):
         """Set up file logging for notifications."""
@@ -302,7 +304,12 @@ class NotificationManager:
             
             # Send message
             async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=timeout) as response:
+                async with session.post(
+                    url,
+                    data=orjson.dumps(payload),
+                    headers={'Content-Type': 'application/json'},
+                    timeout=timeout
+                ) as response:
                     if response.status == 200:
                         # Record successful send time
                         self.telegram_message_times.append(time.time())
@@ -480,7 +487,7 @@ class NotificationManager:
             async with aiohttp.ClientSession() as session:
                 async with session.get(url, timeout=10) as response:
                     if response.status == 200:
-                        bot_info = await response.json()
+                        bot_info = await response.json(loads=orjson.loads)
                         if bot_info.get('ok'):
                             print(f"✅ Telegram bot connected: {bot_info['result']['first_name']}")
                             
@@ -15,7 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from playwright.async_api import async_playwright
 import re
 
-async def debug_modal_opening():
+async def debug_modal_opening(*, headless=False, pause_after=15):
     """Debug the modal opening process"""
     
     # Load config
@@ -30,7 +30,7 @@ async def debug_modal_opening():
     print("=" * 60)
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
+        browser = await p.chromium.launch(headless=headless)
         page = await browser.new_page()
         
         try:
@@ -221,8 +221,10 @@ async def debug_modal_opening():
             await page.screenshot(path="debug_modal.png")
             print("\n📸 Screenshot saved as 'debug_modal.png'")
             
-            print("\n⏳ Browser will close in 15 seconds...")
-            await asyncio.sleep(15)
+            # Only keep a visible browser open for inspection
+            if pause_after > 0 and not headless:
+                print(f"\n⏳ Browser will close in {pause_after} seconds...")
+                await asyncio.sleep(pause_after)
             
         except Exception as e:
             print(f"❌ Error during debugging: {e}")
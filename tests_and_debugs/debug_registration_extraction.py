@@ -15,7 +15,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from playwright.async_api import async_playwright
 import re
 
-async def debug_registration_extraction():
+async def debug_registration_extraction(*, headless=True, pause_after=0):
     """Debug the registration date extraction specifically"""
     
     # Load config
@@ -30,7 +30,7 @@ async def debug_registration_extraction():
     print("=" * 60)
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=headless)
         page = await browser.new_page()
         
         try:
@@ -147,8 +147,10 @@ async def debug_registration_extraction():
             await page.screenshot(path="debug_registration.png")
             print("\n📸 Screenshot saved as 'debug_registration.png'")
             
-            print("\n⏳ Browser will close in 5 seconds...")
-            await asyncio.sleep(5)
+            # Only keep a visible browser open for inspection
+            if pause_after > 0 and not headless:
+                print(f"\n⏳ Browser will close in {pause_after} seconds...")
+                await asyncio.sleep(pause_after)
             
         except Exception as e:
             print(f"❌ Error during debugging: {e}")
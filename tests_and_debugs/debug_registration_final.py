@@ -15,7 +15,14 @@ import re
 # Add parent directory to path so we can import modules from the root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-async def debug_registration_final():
+# Selectors used to open the views modal and its tooltip
+_SEL_DETAIL_BTN = '.DetailSummary_btn_detail__msm-h'
+_SEL_MODAL_CONTENTS = '.BottomSheet-module_inner_contents__-vTmf'
+_SEL_QUESTION_BTN = 'button:has-text("조회수 자세히보기")'
+_SEL_TOOLTIP = '[class*="tooltip"]'
+_SEL_TOOLTIP_LIKE = '[class*="tooltip" i],[class*="popover" i]'
+
+async def debug_registration_final(*, headless=True, pause_after=0):
     """Debug registration extraction after modal is opened"""
     
     # Load config from parent directory
@@ -30,7 +37,7 @@ async def debug_registration_final():
     print("=" * 60)
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        browser = await p.chromium.launch(headless=headless)
         page = await browser.new_page()
         
         try:
@@ -53,20 +60,20 @@ async def debug_registration_final():
             
             # Open modal
             print("\n🔍 Opening modal...")
-            detail_button = await page.wait_for_selector('.DetailSummary_btn_detail__msm-h', timeout=10000)
+            detail_button = await page.wait_for_selector(_SEL_DETAIL_BTN, timeout=10000)
             if detail_button:
                 print("✅ Found detail button, clicking...")
                 await detail_button.click()
                 await page.wait_for_timeout(3000)
                 
                 # Wait for modal to open
-                modal_ul = await page.wait_for_selector('.BottomSheet-module_inner_contents__-vTmf', timeout=5000)
+                modal_ul = await page.wait_for_selector(_SEL_MODAL_CONTENTS, timeout=5000)
                 if modal_ul:
                     print("✅ Modal opened successfully")
                     
                     # Find question button
                     print("\n🔍 Looking for question button...")
-                    question_button = await page.wait_for_selector('button:has-text("조회수 자세히보기")', timeout=5000)
+                    question_button = await page.wait_for_selector(_SEL_QUESTION_BTN, timeout=5000)
                     if question_button:
                         print("✅ Found question button, clicking...")
                         await question_button.click()
@@ -79,13 +86,14 @@ async def debug_registration_final():
                         await page.wait_for_timeout(1000)
                         
                         # Check for tooltip elements
-                        tooltip_elements = await page.query_selector_all('[class*="tooltip"]')
+                        tooltip_elements = await page.query_selector_all(_SEL_TOOLTIP)
                         print(f"Found {len(tooltip_elements)} tooltip elements")
                         
                         for i, elem in enumerate(tooltip_elements):
                             try:
-                                elem_class = await elem.get_attribute('class')
-                                elem_text = await elem.inner_text()
+                                # Read class and text in a single round-trip
+                                data = await elem.evaluate("e => ({cls: e.className, text: e.innerText})")
+                                elem_class, elem_text = data['cls'], data['text']
                                 print(f"\nTooltip {i+1}:")
                                 print(f"  Class: {elem_class}")
                                 print(f"  Text: '{elem_text[:200]}...'")
@@ -109,23 +117,15 @@ async def debug_registration_final():
                             
                             # Check for any new elements that appeared
                             print("\n🔍 Checking for any new elements after clicking...")
-                            all_elements = await page.query_selector_all('*')
-                            new_elements = []
-                            
-                            for elem in all_elements[:50]:
-                                try:
-                                    elem_class = await elem.get_attribute('class')
-                                    elem_text = await elem.inner_text()
-                                    if elem_class and any(keyword in elem_class for keyword in ['tooltip', 'Tooltip', 'popover', 'Popover']):
-                                        new_elements.append((elem_class, elem_text[:100]))
-                                except:
-                                    continue
+                            new_elements = await page.locator(_SEL_TOOLTIP_LIKE).evaluate_all(
+                                "els => els.map(e => ({cls: e.className, text: (e.innerText || '').slice(0, 100)}))"
+                            )
                             
                             if new_elements:
                                 print("🔍 Found potential tooltip elements:")
-                                for class_name, text in new_elements:
-                                    print(f"  Class: {class_name}")
-                                    print(f"  Text: {text}")
+                                for elem_data in new_elements:
+                                    print(f"  Class: {elem_data['cls']}")
+                                    print(f"  Text: {elem_data['text']}")
                             else:
                                 print("❌ No tooltip-like elements found")
                     else:
@@ -139,8 +139,10 @@ async def debug_registration_final():
             await page.screenshot(path="debug_registration_final.png")
             print("\n📸 Screenshot saved as 'debug_registration_final.png'")
             
-            print("\n⏳ Browser will close in 5 seconds...")
-            await asyncio.sleep(5)
+            # Only keep a visible browser open for inspection
+            if pause_after > 0 and not headless:
+                print(f"\n⏳ Browser will close in {pause_after} seconds...")
+                await asyncio.sleep(pause_after)
             
         except Exception as e:
             print(f"❌ Error during debugging: {e}")
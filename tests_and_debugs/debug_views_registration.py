@@ -9,69 +9,180 @@ import logging
 import yaml
 import sys
 import os
+import json
+from datetime import datetime
+from pathlib import Path
 
 # Add parent directory to path so we can import modules from the root
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import aiohttp
 from playwright.async_api import async_playwright
 import re
 from typing import Optional
+from encar_api_client import AUTH_STATE_PATH, get_client, close_client
 
-async def debug_single_car(car_id: str, listing_url: str):
-    """Debug views and registration extraction for a single car"""
-    print(f"🔍 Debugging car ID: {car_id}")
-    print(f"   URL: {listing_url}")
+# Pre-compiled extraction patterns
+VIEWS_RE = re.compile(r'조회수\s*([\d,]+)')
+LABELED_REG_DATE_RE = re.compile(r'(?:최초등록일|등록일|최초)\s*(\d{4}/\d{2}/\d{2})')
+ANY_DATE_RE = re.compile(r'(\d{4}/\d{2}/\d{2})')
+
+# Number of queue workers debugging cars at the same time against the shared browser
+MAX_CONCURRENT_CARS = 5
+
+# Sub-resources that are not needed to read views/registration text
+BLOCKED_RESOURCE_TYPES = {"image", "stylesheet", "font", "media"}
+
+# Disable image loading/decoding in Chromium itself, before any request interception
+CHROMIUM_LAUNCH_ARGS = [
+    "--blink-settings=imagesEnabled=false",
+    "--disable-gpu",
+    "--disable-dev-shm-usage"
+]
+
+# Per-car extraction results kept between debug runs
+CACHE_PATH = Path(__file__).resolve().parent / "debug_cache.json"
+
+# Cookies/localStorage of the shared browser context kept between debug runs; the same
+# session file the API client saves and reuses
+STORAGE_STATE_PATH = AUTH_STATE_PATH
+
+def load_debug_cache() -> dict:
+    """Load cached extraction results keyed by car ID"""
+    try:
+        return json.loads(CACHE_PATH.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_debug_cache(cache: dict):
+    """Persist cached extraction results"""
+    CACHE_PATH.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding='utf-8')
+
+# Headers for the HTTP-only fast path
+STATIC_FETCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
+}
+
+async def fetch_static_details(session: aiohttp.ClientSession, listing_url: str, log=print) -> Optional[dict]:
+    """Read views and registration date from the server HTML, or None if it needs a browser"""
+    try:
+        async with session.get(listing_url, headers=STATIC_FETCH_HEADERS,
+                               timeout=aiohttp.ClientTimeout(total=15)) as response:
+            if response.status != 200:
+                return None
+            html = await response.text()
+    except Exception as e:
+        log(f"   ⚠️ Static fetch failed, using browser: {e}")
+        return None
+    
+    if "조회수" not in html or "최초등록일" not in html:
+        return None
+    
+    views_match = VIEWS_RE.search(html)
+    date_match = LABELED_REG_DATE_RE.search(html)
+    if not views_match or not date_match:
+        return None
+    return {
+        'views': int(views_match.group(1).replace(',', '')),
+        'registration_date': date_match.group(1)
+    }
+
+async def _block_heavy_resources(route):
+    """Abort requests for resource types the debugger never reads"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def debug_single_car(car_id: str, listing_url: str, context, cache: Optional[dict] = None,
+                           force: bool = False, session: Optional[aiohttp.ClientSession] = None,
+                           *, capture_screenshots: bool = False):
+    """Debug views and registration extraction for a single car in its own page of the shared context"""
+    # Buffer this car's output and write it in one go, so parallel workers don't interleave lines
+    lines = []
+    try:
+        await _debug_single_car(car_id, listing_url, context, cache, force, session,
+                                capture_screenshots, lines.append)
+    finally:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+async def _debug_single_car(car_id: str, listing_url: str, context, cache: Optional[dict],
+                            force: bool, session: Optional[aiohttp.ClientSession],
+                            capture_screenshots: bool, log):
+    """Run the extraction methods for one car, sending output lines to log"""
+    log(f"🔍 Debugging car ID: {car_id}")
+    log(f"   URL: {listing_url}")
+    
+    if cache is not None and car_id in cache and not force:
+        log(f"   💾 Cached result: {cache[car_id]}")
+        return
+    
+    # HTTP-only fast path when the data is already in the server-rendered HTML
+    if session is not None:
+        details = await fetch_static_details(session, listing_url, log)
+        if details:
+            log(f"   ⚡ Found in static HTML: views={details['views']}, "
+                f"registration date={details['registration_date']}")
+            if cache is not None:
+                cache[car_id] = {**details, 'timestamp': datetime.now().isoformat()}
+                save_debug_cache(cache)
+            return
     
-    browser = None
+    views = None
+    registration_date = None
+    page = None
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)  # Set to False for debugging
-            page = await browser.new_page()
-            
-            # Set longer timeout and more flexible navigation
-            page.set_default_timeout(60000)  # 60 seconds
-            
-            print("   🌐 Navigating to page...")
-            try:
-                await page.goto(listing_url, wait_until='domcontentloaded', timeout=60000)
-                await page.wait_for_timeout(5000)  # Wait longer for page to load
-                print("   📄 Page loaded successfully")
-            except Exception as e:
-                print(f"   ⚠️ Navigation timeout, but continuing: {e}")
-            
-            # Take initial screenshot
+        page = await context.new_page()
+        
+        # Set longer timeout and more flexible navigation
+        page.set_default_timeout(60000)  # 60 seconds
+        
+        log("   🌐 Navigating to page...")
+        try:
+            await page.goto(listing_url, wait_until='domcontentloaded', timeout=60000)
+            await page.wait_for_selector(':text("조회수")', timeout=15000)  # Wait until views are rendered
+            log("   📄 Page loaded successfully")
+        except Exception as e:
+            log(f"   ⚠️ Navigation timeout, but continuing: {e}")
+        
+        # Take initial screenshot
+        if capture_screenshots:
             screenshot_path = f"debug_{car_id}_initial.png"
             await page.screenshot(path=screenshot_path)
-            print(f"   📸 Initial screenshot saved: {screenshot_path}")
-            
-            # Try multiple approaches to find views and registration
-            print("   🔍 Attempting multiple extraction methods...")
-            
-            # Method 1: Look for any element with 조회수 (views)
-            print("   📊 Method 1: Searching for views...")
-            try:
-                # Search for any element containing 조회수
-                views_elements = await page.query_selector_all('*:has-text("조회수")')
-                print(f"   📋 Found {len(views_elements)} elements with 조회수")
-                
-                for i, elem in enumerate(views_elements[:3]):  # Check first 3
-                    try:
-                        text = await elem.inner_text()
-                        print(f"   📝 Element {i+1}: {text}")
-                        
-                        # Try to extract views number
-                        views_match = re.search(r'조회수\s*([\d,]+)', text)
-                        if views_match:
-                            views_str = views_match.group(1).replace(',', '')
-                            views = int(views_str)
-                            print(f"   👁️ Found views: {views}")
-                            break
-                    except Exception as e:
-                        print(f"   ⚠️ Error reading element {i+1}: {e}")
-            except Exception as e:
-                print(f"   ❌ Method 1 failed: {e}")
-            
+            log(f"   📸 Initial screenshot saved: {screenshot_path}")
+        
+        # Try multiple approaches to find views and registration
+        log("   🔍 Attempting multiple extraction methods...")
+        
+        # Extract the page text once and run all checks locally
+        page_text = ""
+        try:
+            page_text = await page.inner_text('body')
+        except Exception as e:
+            log(f"   ⚠️ Could not read page text: {e}")
+        
+        # Method 1: Look for 조회수 (views) in the page text
+        log("   📊 Method 1: Searching for views...")
+        views_match = VIEWS_RE.search(page_text)
+        if views_match:
+            views = int(views_match.group(1).replace(',', ''))
+            log(f"   👁️ Found views: {views}")
+        else:
+            log("   ❌ Views not found in page text")
+        
+        # Registration date is sometimes already shown on the listing page
+        date_match = LABELED_REG_DATE_RE.search(page_text)
+        if date_match:
+            registration_date = date_match.group(1)
+            log(f"   📅 Found registration date on page: {registration_date}")
+        
+        # Method 2 is only needed when Method 1 did not find both fields
+        if views is not None and registration_date is not None:
+            log("   ⏭️ Method 2 skipped: views and registration date already found")
+        else:
             # Method 2: Look for detail button with more flexible selector
-            print("   📋 Method 2: Looking for detail button...")
+            log("   📋 Method 2: Looking for detail button...")
             try:
                 # Try multiple possible selectors for detail button
                 detail_selectors = [
@@ -82,141 +193,160 @@ async def debug_single_car(car_id: str, listing_url: str):
                     '[class*="DetailSummary"]'
                 ]
                 
+                # Probe all candidates with a single union selector instead of one wait per selector
                 detail_button = None
-                for selector in detail_selectors:
-                    try:
-                        detail_button = await page.wait_for_selector(selector, timeout=5000)
-                        if detail_button:
-                            print(f"   ✅ Found detail button with selector: {selector}")
-                            break
-                    except:
-                        continue
+                try:
+                    detail_button = await page.wait_for_selector(
+                        ", ".join(detail_selectors), timeout=8000, state="visible"
+                    )
+                    log("   ✅ Found detail button")
+                except Exception:
+                    pass
                 
                 if detail_button:
                     await detail_button.click()
-                    await page.wait_for_timeout(3000)
-                    print("   📋 Detail modal opened")
+                    try:
+                        await page.wait_for_selector(':text("최초등록일")', timeout=10000)
+                    except Exception as e:
+                        log(f"   ⚠️ Registration date not rendered in modal: {e}")
+                    log("   📋 Detail modal opened")
                     
                     # Take screenshot after modal opens
-                    modal_screenshot = f"debug_{car_id}_modal.png"
-                    await page.screenshot(path=modal_screenshot)
-                    print(f"   📸 Modal screenshot saved: {modal_screenshot}")
+                    if capture_screenshots:
+                        modal_screenshot = f"debug_{car_id}_modal.png"
+                        await page.screenshot(path=modal_screenshot)
+                        log(f"   📸 Modal screenshot saved: {modal_screenshot}")
                     
                     # Look for registration date in modal
-                    print("   📅 Looking for registration date...")
+                    log("   📅 Looking for registration date...")
                     try:
-                        # Try to find registration date in modal content
-                        reg_elements = await page.query_selector_all('*:has-text("최초등록일")')
-                        print(f"   📋 Found {len(reg_elements)} elements with 최초등록일")
+                        # Re-read the page text once now that the modal is open
+                        page_text = await page.inner_text('body')
+                        log(f"   📄 Modal text length: {len(page_text)} characters")
                         
-                        if len(reg_elements) == 0:
-                            # Try alternative approach - look for registration date in the modal text
-                            modal_text = await page.inner_text('body')
-                            print(f"   📄 Modal text length: {len(modal_text)} characters")
-                            
-                            # Look for registration date patterns
-                            reg_patterns = [
-                                r'최초등록일\s*(\d{4}/\d{2}/\d{2})',
-                                r'등록일\s*(\d{4}/\d{2}/\d{2})',
-                                r'최초\s*(\d{4}/\d{2}/\d{2})',
-                                r'(\d{4}/\d{2}/\d{2})'
-                            ]
-                            
-                            for pattern in reg_patterns:
-                                date_match = re.search(pattern, modal_text)
-                                if date_match:
-                                    registration_date = date_match.group(1)
-                                    print(f"   📅 Found registration date with pattern '{pattern}': {registration_date}")
-                                    break
-                            else:
-                                print("   ❌ Registration date not found with any pattern")
+                        # Prefer a labelled date, fall back to any date in the modal
+                        date_match = LABELED_REG_DATE_RE.search(page_text) or ANY_DATE_RE.search(page_text)
+                        if date_match:
+                            registration_date = date_match.group(1)
+                            log(f"   📅 Found registration date: {registration_date}")
                         else:
-                            for i, elem in enumerate(reg_elements):
-                                try:
-                                    text = await elem.inner_text()
-                                    print(f"   📝 Registration element {i+1}: {text}")
-                                    
-                                    date_match = re.search(r'최초등록일\s*(\d{4}/\d{2}/\d{2})', text)
-                                    if date_match:
-                                        registration_date = date_match.group(1)
-                                        print(f"   📅 Found registration date: {registration_date}")
-                                        break
-                                except Exception as e:
-                                    print(f"   ⚠️ Error reading registration element {i+1}: {e}")
+                            log("   ❌ Registration date not found with any pattern")
                     except Exception as e:
-                        print(f"   ❌ Error looking for registration date: {e}")
+                        log(f"   ❌ Error looking for registration date: {e}")
                 else:
-                    print("   ❌ Detail button not found with any selector")
+                    log("   ❌ Detail button not found with any selector")
             except Exception as e:
-                print(f"   ❌ Method 2 failed: {e}")
-            
-            # Method 3: Try to find any information about the car
-            print("   🔍 Method 3: Looking for any car information...")
-            try:
-                # Look for any text that might contain car details
-                page_text = await page.inner_text('body')
-                print(f"   📄 Page text length: {len(page_text)} characters")
-                
-                # Look for specific patterns
-                if "조회수" in page_text:
-                    print("   ✅ Found 조회수 in page text")
-                if "최초등록일" in page_text:
-                    print("   ✅ Found 최초등록일 in page text")
-                if "GLE" in page_text:
-                    print("   ✅ Found GLE in page text")
-                    
-            except Exception as e:
-                print(f"   ❌ Method 3 failed: {e}")
-            
+                log(f"   ❌ Method 2 failed: {e}")
+        
+        # Method 3: Try to find any information about the car
+        log("   🔍 Method 3: Looking for any car information...")
+        # Reuses the latest page text snapshot (after the modal if it was opened), no extra body fetch
+        for needle in ("조회수", "최초등록일", "GLE"):
+            found = needle in page_text
+            log(f"   {'✅ Found' if found else '❌ Missing'} {needle} in page text")
+        
+        # Only cache complete results; a car missing either field is worth debugging again
+        if cache is not None and views is not None and registration_date is not None:
+            cache[car_id] = {
+                'views': views,
+                'registration_date': registration_date,
+                'timestamp': datetime.now().isoformat()
+            }
+            save_debug_cache(cache)
+        
     except Exception as e:
-        print(f"   ❌ Error during debugging: {e}")
+        log(f"   ❌ Error during debugging: {e}")
     finally:
-        if browser:
-            await browser.close()
+        if page:
+            await page.close()
 
-async def test_with_api_cars():
-    """Test with real car IDs from the API"""
+async def test_with_api_cars(force: bool = False, capture_screenshots: bool = False, limit: Optional[int] = None):
+    """Test with real car IDs from the API (cached cars are skipped unless force is set)"""
     
     # Load config
     config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.yaml')
     with open(config_path, 'r', encoding='utf-8') as f:
         config = yaml.safe_load(f)
     
-    from encar_api_client import EncarAPIClient
-    
     try:
-        async with EncarAPIClient(config) as api_client:
-            print("🧪 DEBUGGING VIEWS AND REGISTRATION EXTRACTION")
-            print("=" * 60)
-            
-            # Get some real listings from API
-            print("📊 Getting real car listings from API...")
-            listings, _ = await api_client.get_listings(limit=3)
+        api_client = await get_client(config)
+        print("🧪 DEBUGGING VIEWS AND REGISTRATION EXTRACTION")
+        print("=" * 60)
+        
+        # Get some real listings from API
+        print("📊 Getting real car listings from API...")
+        if limit is None:
+            limit = config.get('debug_batch_size', 50)
+        listings, _ = await api_client.get_listings(limit=limit)
+        
+        if not listings:
+            print("❌ No listings found from API")
+            return
+        
+        print(f"📊 Found {len(listings)} cars to test")
+        
+        cars = []
+        for i, listing in enumerate(listings):
+            car_id = listing.get('car_id', f'API_{i}')
+            listing_url = listing.get('listing_url', '')
             
-            if not listings:
-                print("❌ No listings found from API")
-                return
+            if not listing_url:
+                print(f"⚠️ Skipping {car_id} - no URL")
+                continue
             
-            print(f"📊 Found {len(listings)} cars to test")
-            
-            for i, listing in enumerate(listings):
-                car_id = listing.get('car_id', f'API_{i}')
-                listing_url = listing.get('listing_url', '')
-                
-                if not listing_url:
-                    print(f"⚠️ Skipping {car_id} - no URL")
-                    continue
-                
-                print(f"\n🚗 Testing car: {car_id}")
-                print(f"   Title: {listing.get('title', 'N/A')}")
-                print(f"   URL: {listing_url}")
-                await debug_single_car(car_id, listing_url)
-                await asyncio.sleep(2)  # Brief pause between tests
+            print(f"\n🚗 Testing car: {car_id}")
+            print(f"   Title: {listing.get('title', 'N/A')}")
+            print(f"   URL: {listing_url}")
+            cars.append((car_id, listing_url))
+        
+        cache = load_debug_cache()
+        
+        # Debug all cars concurrently against one shared browser
+        async with async_playwright() as p, aiohttp.ClientSession() as session:
+            browser = await p.chromium.launch(
+                headless=True,  # Set to False for debugging
+                args=CHROMIUM_LAUNCH_ARGS
+            )
+            context = await browser.new_context(
+                storage_state=str(STORAGE_STATE_PATH) if STORAGE_STATE_PATH.exists() else None
+            )
+            await context.route("**/*", _block_heavy_resources)
+            queue = asyncio.Queue()
+            for car in cars:
+                queue.put_nowait(car)
             
-            print("\n✅ Debug testing completed!")
+            async def worker():
+                # Each worker pulls the next car as soon as it is free, so slow pages don't block fast ones
+                while not queue.empty():
+                    car_id, listing_url = queue.get_nowait()
+                    await debug_single_car(car_id, listing_url, context, cache, force, session,
+                                           capture_screenshots=capture_screenshots)
             
+            try:
+                await asyncio.gather(*(worker() for _ in range(min(MAX_CONCURRENT_CARS, len(cars)))))
+            finally:
+                await context.storage_state(path=str(STORAGE_STATE_PATH))
+                await browser.close()
+        
+        print("\n✅ Debug testing completed!")
+        
     except Exception as e:
         print(f"❌ Error accessing API: {e}")
 
+async def main(force: bool = False, capture_screenshots: bool = False, limit: Optional[int] = None):
+    """Run the debug batch and release the shared API client afterwards"""
+    try:
+        await test_with_api_cars(force=force, capture_screenshots=capture_screenshots, limit=limit)
+    finally:
+        await close_client()
+
 if __name__ == "__main__":
-    asyncio.run(test_with_api_cars()) 
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Debug views and registration extraction")
+    parser.add_argument('--force', action='store_true', help='Re-debug cars that are already cached')
+    parser.add_argument('--verbose', action='store_true', help='Save page and modal screenshots for each car')
+    parser.add_argument('--limit', type=int, help='Number of listings to fetch (default: debug_batch_size or 50)')
+    args = parser.parse_args()
+    
+    asyncio.run(main(force=args.force, capture_screenshots=args.verbose, limit=args.limit)) 
\ No newline at end of file
@@ -78,7 +78,7 @@ async def test_single_car_extraction():
     
     print("\n✅ Single car extraction test completed!")
 
-async def debug_page_content():
+async def debug_page_content(*, headless=False, pause_after=10):
     """Debug function to see what's actually on the page"""
     import yaml
     from playwright.async_api import async_playwright
@@ -95,7 +95,7 @@ async def debug_page_content():
     print("=" * 60)
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)  # Set to False to see the browser
+        browser = await p.chromium.launch(headless=headless)  # Set to False to see the browser
         page = await browser.new_page()
         
         try:
@@ -130,9 +130,10 @@ async def debug_page_content():
             await page.screenshot(path="debug_page.png")
             print("\n📸 Screenshot saved as 'debug_page.png'")
             
-            # Wait for user to see the browser
-            print("\n⏳ Browser will close in 10 seconds...")
-            await asyncio.sleep(10)
+            # Wait for user to see the browser (only when it is visible)
+            if pause_after > 0 and not headless:
+                print(f"\n⏳ Browser will close in {pause_after} seconds...")
+                await asyncio.sleep(pause_after)
             
         except Exception as e:
             print(f"❌ Error during debugging: {e}")
@@ -5,11 +5,16 @@ Utility functions for the Encar monitoring system.
 
 import asyncio
 import logging
+import re
 import yaml
 from datetime import datetime
 from typing import Dict, List
 from playwright.async_api import async_playwright
 
+# Patterns used to strip non-numeric characters from scraped values
+NON_PRICE_CHARS_RE = re.compile(r'[^\d.]')
+NON_DIGIT_RE = re.compile(r'[^\d]')
+
 def load_config(config_path: str = "config.yaml") -> Dict:
     """Load configuration from YAML file."""
     try:
@@ -155,8 +160,7 @@ def parse_korean_price(price_str: str) -> float:
     """Parse Korean price string to float (in 만원 units)."""
     try:
         # Remove non-numeric characters except for decimal point
-        import re
-        numeric = re.sub(r'[^\d.]', '', price_str)
+        numeric = NON_PRICE_CHARS_RE.sub('', price_str)
         return float(numeric) if numeric else 0.0
     except:
         return 0.0
@@ -165,8 +169,7 @@ def parse_korean_mileage(mileage_str: str) -> int:
     """Parse Korean mileage string to integer."""
     try:
         # Extract number and convert km to integer
-        import re
-        numeric = re.sub(r'[^\d]', '', mileage_str)
+        numeric = NON_DIGIT_RE.sub('', mileage_str)
         return int(numeric) if numeric else 0
     except:
         return 0